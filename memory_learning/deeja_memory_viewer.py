@@ -1,28 +1,133 @@
 
+import io
+import os
 import json
+import re
+import mmap
+import functools
 import gradio as gr
 
-# Load memory from JSONL
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Files at least this large are searched through mmap instead of being indexed in RAM
+MMAP_SEARCH_THRESHOLD = 64 * 1024 * 1024
+
+# Read raw memory lines from JSONL in one pass (bytes; both parsers decode UTF-8 themselves)
+def iter_memory(filepath):
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    for line in data.splitlines():
+        if line:
+            yield line
+
+def _haystack(item):
+    return (item['user_input'] + '\n' + item['deeja_response'] + '\n' + item['topic']).lower()
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Parse the memory file once per (path, mtime, size) version;
+# each record carries one pre-lowercased haystack of its searchable fields.
+# The trigram -> row ids index starts empty and only gains the trigrams that
+# queries actually use: indexing every trigram up front costs seconds and
+# ~10x the file size in RAM, while each on-demand posting is one list of ints.
+@functools.lru_cache(maxsize=4)
+def _load_memory_cached(filepath, mtime, size):
+    rows = [(item, _haystack(item)) for item in map(_loads, iter_memory(filepath))]
+    return rows, {}
+
 def load_memory(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return [json.loads(line) for line in f]
+    return _load_memory_cached(filepath, os.path.getmtime(filepath), os.path.getsize(filepath))
+
+def _posting(trigram, rows, trigram_to_rows):
+    posting = trigram_to_rows.get(trigram)
+    if posting is None:
+        posting = [row_id for row_id, (_, haystack) in enumerate(rows) if trigram in haystack]
+        trigram_to_rows[trigram] = posting
+    return posting
+
+def _candidate_rows(keyword, rows, trigram_to_rows):
+    if len(keyword) < 3:
+        return rows
+    postings = []
+    for trigram in _trigrams(keyword):
+        posting = _posting(trigram, rows, trigram_to_rows)
+        if not posting:
+            return []
+        postings.append(posting)
+    postings.sort(key=len)
+    row_ids = set(postings[0]).intersection(*postings[1:])
+    return [rows[row_id] for row_id in sorted(row_ids)]
+
+# Form of the keyword as it appears inside a JSON string (", \\ and control characters escaped).
+# None when that form is ambiguous: writers may or may not escape "/" as "\/".
+def _json_needle(keyword):
+    if '/' in keyword:
+        return None
+    return json.dumps(keyword, ensure_ascii=False)[1:-1].encode('utf-8')
+
+# Scan a memory-mapped file for the keyword in C and parse only the lines that contain a hit.
+# Matching is on the raw JSON bytes (ASCII case-insensitive; Thai has no case),
+# so callers still recheck the parsed record's haystack.
+def iter_memory_mmap_matches(keyword, filepath):
+    pattern = re.compile(re.escape(_json_needle(keyword)), re.IGNORECASE)
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while True:
+                match = pattern.search(mm, pos)
+                if match is None:
+                    break
+                start = mm.rfind(b'\n', 0, match.start()) + 1
+                end = mm.find(b'\n', match.end())
+                if end == -1:
+                    end = len(mm)
+                if end > start:
+                    item = _loads(mm[start:end])
+                    yield item, _haystack(item)
+                pos = end + 1
 
 # Search memory by keyword in topic, user_input, or deeja_response
 def search_memory(keyword, filepath="memory_chat2025.jsonl"):
-    keyword = keyword.lower()
-    memory = load_memory(filepath)
-    results = [
-        f"🧠 {item['memory_id']} | {item['topic']}\n"
-        f"👤 {item['user_input']}\n"
-        f"🤖 {item['deeja_response']}\n"
-        f"🎯 Intent: {item['intent']} | ❤️ Sentiment: {item['sentiment']}\n"
-        "--------------------------------------------------"
-        for item in memory
-        if keyword in item['user_input'].lower() or
-           keyword in item['deeja_response'].lower() or
-           keyword in item['topic'].lower()
-    ]
-    return "\n\n".join(results) if results else "No memory found."
+    stat = os.stat(filepath)
+    return _search_memory_cached(keyword.lower(), filepath, stat.st_mtime, stat.st_size)
+
+# Identical repeat searches against the same file version are served from cache
+@functools.lru_cache(maxsize=32)
+def _search_memory_cached(keyword, filepath, mtime, size):
+    if size >= MMAP_SEARCH_THRESHOLD and _json_needle(keyword) is not None:
+        candidates = iter_memory_mmap_matches(keyword, filepath)
+    elif size >= MMAP_SEARCH_THRESHOLD:
+        # No reliable raw-bytes needle: stream every record instead of indexing a large file
+        candidates = ((item, _haystack(item)) for item in map(_loads, iter_memory(filepath)))
+    else:
+        rows, trigram_to_rows = load_memory(filepath)
+        candidates = _candidate_rows(keyword, rows, trigram_to_rows)
+    buf = io.StringIO()
+    for item, haystack in candidates:
+        if keyword not in haystack:
+            continue
+        if buf.tell():
+            buf.write("\n\n")
+        buf.write("🧠 ")
+        buf.write(item['memory_id'])
+        buf.write(" | ")
+        buf.write(item['topic'])
+        buf.write("\n👤 ")
+        buf.write(item['user_input'])
+        buf.write("\n🤖 ")
+        buf.write(item['deeja_response'])
+        buf.write("\n🎯 Intent: ")
+        buf.write(item['intent'])
+        buf.write(" | ❤️ Sentiment: ")
+        buf.write(item['sentiment'])
+        buf.write("\n--------------------------------------------------")
+    return buf.getvalue() or "No memory found."
 
 # Gradio GUI
 def launch_memory_viewer():
@@ -33,6 +138,8 @@ def launch_memory_viewer():
         title="🧠 Deeja Memory Viewer",
         description="สำรวจความทรงจำที่ดีจ้าจำไว้จากบทสนทนา"
     )
+    # Queue searches so concurrent users are not serialized behind one request
+    iface.queue(default_concurrency_limit=4, max_size=32)
     iface.launch()
 
 if __name__ == "__main__":
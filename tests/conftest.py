@@ -0,0 +1,31 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from zynx_agi.ai_platforms.thai_cultural_mcp import app, get_current_user, TokenData
+from zynx_agi.api.chat import router as chat_router
+
+# Mock authentication for chat_client
+async def mock_get_current_user() -> TokenData:
+    return TokenData(username="testuser")
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Client for the main MCP app (which has /token, /api/v1/cultural/*)"""
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def chat_client() -> TestClient:
+    """Client for an isolated app that mounts the chat router once per session"""
+    test_app = FastAPI()
+    test_app.include_router(chat_router)
+    test_app.dependency_overrides[get_current_user] = mock_get_current_user
+    return TestClient(test_app)
+
+@pytest.fixture(scope="session")
+def admin_token(client: TestClient) -> str:
+    """Log in once and share the access token across tests"""
+    response = client.post(
+        "/token",
+        data={"username": "admin", "password": "password"}
+    )
+    return response.json()["access_token"]
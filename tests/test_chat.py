@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from zynx_agi.api import chat
+from zynx_agi.api.chat import ChatMessage, process_message_with_cultural_context
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    chat._response_cache.clear()
+    yield
+    chat._response_cache.clear()
+
+@pytest.mark.asyncio
+async def test_duplicate_requests_share_one_call():
+    """Concurrent identical messages are served by a single upstream call"""
+    calls = 0
+
+    async def fake_process(message, client):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"text": "ok", "model": message.model}
+
+    with patch("zynx_agi.api.chat._process_message_with_cultural_context", fake_process):
+        results = await asyncio.gather(*(
+            process_message_with_cultural_context(ChatMessage(text="สวัสดี  ครับ"), None)
+            for _ in range(5)
+        ))
+
+    assert calls == 1
+    assert all(result == {"text": "ok", "model": "deeja-v1"} for result in results)
+
+@pytest.mark.asyncio
+async def test_duplicate_request_survives_cancelled_leader():
+    """A duplicate waiting on a cancelled leader runs the call itself instead of being cancelled"""
+    calls = 0
+    leader_started = asyncio.Event()
+
+    async def fake_process(message, client):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            leader_started.set()
+            await asyncio.sleep(10)
+        return {"text": "ok", "model": message.model}
+
+    with patch("zynx_agi.api.chat._process_message_with_cultural_context", fake_process):
+        leader = asyncio.create_task(process_message_with_cultural_context(ChatMessage(text="hello"), None))
+        await leader_started.wait()
+        follower = asyncio.create_task(process_message_with_cultural_context(ChatMessage(text="hello"), None))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == {"text": "ok", "model": "deeja-v1"}
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    assert calls == 2
+    assert not chat._inflight
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+@pytest.mark.asyncio
+async def test_analyze_batch_retries_items_when_batch_fails():
+    """A short batch response falls back to per-text requests; only the bad text's caller fails"""
+    async def fake_request(method, url, json):
+        if url.endswith("/analyze_batch"):
+            return FakeResponse(200, [{"text": json["texts"][0]}])
+        if json["text"] == "bad":
+            return FakeResponse(500, {"detail": "boom"})
+        return FakeResponse(200, {"text": json["text"]})
+
+    mcp = chat.ThaiCulturalMCPClient()
+    loop = asyncio.get_running_loop()
+    batch = [(text, loop.create_future()) for text in ("a", "bad", "c")]
+    with patch.object(mcp, "_request", fake_request):
+        await mcp._analyze_batch(batch)
+    await mcp.aclose()
+
+    assert all(future.done() for _, future in batch)
+    assert batch[0][1].result() == {"text": "a"}
+    assert isinstance(batch[1][1].exception(), chat.HTTPException)
+    assert batch[2][1].result() == {"text": "c"}
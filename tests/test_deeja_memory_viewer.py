@@ -0,0 +1,30 @@
+import json
+import pytest
+
+pytest.importorskip("gradio")
+from memory_learning import deeja_memory_viewer as viewer
+
+RECORDS = [
+    {"memory_id": "m0", "topic": "Archive", "intent": "Statement", "sentiment": "Neutral",
+     "user_input": 'คุณเลือก "Archive" ไหม', "deeja_response": "ใช่ครับ\tแยก\\ไว้"},
+    {"memory_id": "m1", "topic": "Paths", "intent": "Question", "sentiment": "Neutral",
+     "user_input": "a/b path", "deeja_response": "line\nbreak"},
+    {"memory_id": "m2", "topic": "Other", "intent": "Statement", "sentiment": "Positive",
+     "user_input": "hello", "deeja_response": "สวัสดีครับ"},
+]
+
+@pytest.mark.parametrize("keyword", ['"archive"', "\tแยก\\", "a/b", "line\nbreak", "สวัสดี", "missing"])
+def test_mmap_search_matches_in_memory_search(tmp_path, monkeypatch, keyword):
+    """Large-file (raw bytes) and in-RAM searches return the same results, escapes included"""
+    path = tmp_path / "memory.jsonl"
+    lines = [json.dumps(record, ensure_ascii=False) for record in RECORDS]
+    # One writer that escapes "/" as well, as some JSON encoders do
+    lines[1] = lines[1].replace("/", "\\/")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    monkeypatch.setattr(viewer, "MMAP_SEARCH_THRESHOLD", float("inf"))
+    in_memory = viewer._search_memory_cached(keyword.lower(), str(path), 0, path.stat().st_size)
+    monkeypatch.setattr(viewer, "MMAP_SEARCH_THRESHOLD", 0)
+    large_file = viewer._search_memory_cached(keyword.lower(), str(path), 1, path.stat().st_size)
+
+    assert large_file == in_memory
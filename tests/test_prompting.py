@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from zynx_agi.ai_platforms import _prompting
+from zynx_agi.ai_platforms._prompting import adjust_cultural_text
+
+class SlowEngine:
+    """Engine whose first call blocks until cancelled"""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+
+    def is_near_target(self, text, context_type):
+        return False
+
+    async def process(self, message):
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            await asyncio.sleep(10)
+        return {"adjusted_text": message["text"] + "ครับ"}
+
+@pytest.mark.asyncio
+async def test_adjustment_waiter_survives_cancelled_leader():
+    """A waiter on a cancelled in-flight adjustment runs the engine itself"""
+    engine = SlowEngine()
+    text = "cancelled-leader-test"
+    _prompting._ADJUSTED_TEXT_CACHE.pop((text, "formal"), None)
+
+    leader = asyncio.create_task(adjust_cultural_text(engine, text, "formal"))
+    await engine.started.wait()
+    waiter = asyncio.create_task(adjust_cultural_text(engine, text, "formal"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == text + "ครับ"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert engine.calls == 2
+    assert not _prompting._ADJUSTMENTS_IN_FLIGHT
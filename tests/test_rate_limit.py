@@ -0,0 +1,44 @@
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from zynx_agi.ai_platforms._rate_limit import AsyncTokenBucket
+from zynx_agi.ai_platforms.batch_dispatcher import AnthropicBatchDispatcher
+
+@pytest.mark.asyncio
+async def test_bucket_waits_once_burst_is_used():
+    """The first `rate` acquisitions pass immediately; the next one waits for a refill"""
+    bucket = AsyncTokenBucket(rate=2, period=0.2)
+
+    start = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    burst = time.monotonic() - start
+    await bucket.acquire()
+    waited = time.monotonic() - start
+
+    assert burst < 0.05
+    assert waited >= 0.09
+
+class FakeMessages:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=42))
+
+@pytest.mark.asyncio
+async def test_realtime_submit_goes_through_bucket():
+    """Tight-budget requests take a bucket token and report their prompt tokens"""
+    client = SimpleNamespace(messages=FakeMessages())
+    bucket = AsyncTokenBucket(rate=5, period=60.0)
+    dispatcher = AnthropicBatchDispatcher(client, rate_limiter=bucket)
+
+    response = await dispatcher.submit(latency_budget_ms=1000, model="claude", max_tokens=10)
+
+    assert response.usage.input_tokens == 42
+    assert client.messages.calls == [{"model": "claude", "max_tokens": 10}]
+    assert bucket._tokens == pytest.approx(4, abs=0.01)
+    assert bucket.tokens_this_minute == 42
+    assert dispatcher._flusher is None
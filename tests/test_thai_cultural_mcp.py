@@ -1,26 +1,8 @@
 import pytest
-from fastapi.testclient import TestClient
-from zynx_agi.ai_platforms.thai_cultural_mcp import app, get_current_user, TokenData
-from zynx_agi.api.chat import router as chat_router, ChatMessage, CulturalContext, ChatResponse
-from fastapi import FastAPI, Depends
+from zynx_agi.api.chat import ChatMessage, CulturalContext, ChatResponse
 from unittest.mock import patch, AsyncMock
 
-# Create test app for chat router
-test_app = FastAPI()
-test_app.include_router(chat_router)
-
-# Client for the main MCP app (which has /token, /api/v1/cultural/*)
-client = TestClient(app)
-# Client for the isolated chat app
-chat_client = TestClient(test_app)
-
-# Mock authentication for chat_client
-async def mock_get_current_user() -> TokenData:
-    return TokenData(username="testuser")
-
-test_app.dependency_overrides[get_current_user] = mock_get_current_user
-
-def test_login():
+def test_login(client):
     """Test login endpoint"""
     response = client.post(
         "/token",
@@ -28,11 +10,10 @@ def test_login():
     )
     assert response.status_code == 200
     assert "access_token" in response.json()
-    return response.json()["access_token"]
 
-def test_cultural_analysis():
+def test_cultural_analysis(client, admin_token):
     """Test cultural analysis endpoint"""
-    token = test_login()
+    token = admin_token
     response = client.post(
         "/api/v1/cultural/analyze",
         json={"text": "สวัสดีครับ ผมชื่อสมชาย"},
@@ -46,9 +27,28 @@ def test_cultural_analysis():
     assert "detected_particles" in data
     assert "cultural_patterns" in data
 
-def test_cultural_adjustment():
+def test_cultural_analysis_batch(client, admin_token):
+    """Test batched cultural analysis endpoint"""
+    token = admin_token
+    texts = ["สวัสดีครับ ผมชื่อสมชาย", "หวัดดี"]
+    response = client.post(
+        "/api/v1/cultural/analyze_batch",
+        json={"texts": texts},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == len(texts)
+    single = client.post(
+        "/api/v1/cultural/analyze",
+        json={"text": texts[0]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert data[0] == single.json()
+
+def test_cultural_adjustment(client, admin_token):
     """Test cultural adjustment endpoint"""
-    token = test_login()
+    token = admin_token
     response = client.post(
         "/api/v1/cultural/adjust",
         json={"text": "สวัสดีครับ ผมชื่อสมชาย"},
@@ -59,7 +59,7 @@ def test_cultural_adjustment():
 
 @patch('zynx_agi.api.chat.mcp_client.adjust_cultural_context', new_callable=AsyncMock)
 @patch('zynx_agi.api.chat.mcp_client.analyze_cultural_context', new_callable=AsyncMock)
-def test_chat_endpoint(mock_analyze_cultural_context, mock_adjust_cultural_context):
+def test_chat_endpoint(mock_analyze_cultural_context, mock_adjust_cultural_context, chat_client, admin_token):
     """Test chat endpoint"""
     # Setup mocks
     mock_analyze_cultural_context.return_value = {
@@ -72,8 +72,7 @@ def test_chat_endpoint(mock_analyze_cultural_context, mock_adjust_cultural_conte
     }
     mock_adjust_cultural_context.return_value = "สวัสดีครับ สมชาย สบายดีไหมครับ"
 
-    token = test_login() # This token is not strictly needed now due to mock_get_current_user for chat_client
-                        # but test_login() also ensures the main app's /token endpoint works.
+    token = admin_token # Not strictly needed due to mock_get_current_user for chat_client
 
     response = chat_client.post(
         "/chat/chat",
@@ -94,7 +93,7 @@ def test_chat_endpoint(mock_analyze_cultural_context, mock_adjust_cultural_conte
     assert "suggestions" in data
     assert "Maintain politeness" in data["suggestions"]
 
-def test_authentication():
+def test_authentication(client):
     """Test authentication"""
     # Test without token
     response = client.post(
@@ -111,9 +110,9 @@ def test_authentication():
     )
     assert response.status_code == 401
 
-def test_cultural_prompts():
+def test_cultural_prompts(client, admin_token):
     """Test cultural prompts endpoint"""
-    token = test_login()
+    token = admin_token
     response = client.get(
         "/api/v1/cultural/prompts",
         headers={"Authorization": f"Bearer {token}"}
@@ -123,9 +122,9 @@ def test_cultural_prompts():
     assert isinstance(data, list)
     assert len(data) > 0
 
-def test_cultural_resources():
+def test_cultural_resources(client, admin_token):
     """Test cultural resources endpoint"""
-    token = test_login()
+    token = admin_token
     response = client.get(
         "/api/v1/cultural/resources",
         headers={"Authorization": f"Bearer {token}"}
@@ -0,0 +1,23 @@
+import sqlite3
+from zynx_agi.monitoring.zynx_monitor import ZynxAGIMonitor
+
+def test_no_queued_event_lost_across_stop(tmp_path):
+    """Events queued while monitoring, and those tracked after stopping, all reach the database"""
+    db_path = str(tmp_path / "metrics.db")
+    monitor = ZynxAGIMonitor(db_path)
+    context = {"primaryCulture": "thai", "formalityLevel": 0.5, "politenessLevel": 0.5}
+
+    monitor.start_monitoring()
+    for i in range(50):
+        monitor.track_chat_request(f"msg-{i}", context, 1.0, "claude")
+    monitor.stop_monitoring()
+    monitor.track_chat_request("after-stop", context, 1.0, "claude")
+
+    assert not monitor._pending_events
+    conn = sqlite3.connect(db_path)
+    # Alerts share this table; count only the tracked chat events
+    rows = conn.execute(
+        "SELECT message_text FROM zynx_cultural_events WHERE detected_culture != 'alert'"
+    ).fetchall()
+    conn.close()
+    assert sorted(text for (text,) in rows) == sorted([f"msg-{i}" for i in range(50)] + ["after-stop"])
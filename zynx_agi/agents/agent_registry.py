@@ -2,14 +2,22 @@
 # This module will be responsible for managing the registration and discovery
 # of Zynx Agents.
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
-class AgentManifest(Dict[str, Any]): # Or a Pydantic model
+class AgentManifest(BaseModel):
     """
     Represents the manifest.yaml for an agent.
-    Example fields: name, version, description, author, triggers, skills_definitions
+    Unknown manifest keys are kept as extra fields.
     """
-    pass
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    version: str
+    description: Optional[str] = None
+    author: Optional[str] = None
+    triggers: List[Dict[str, Any]] = Field(default_factory=list)
+    skills: List[Dict[str, Any]] = Field(default_factory=list)
 
 class AgentRegistry:
     def __init__(self):
@@ -22,15 +30,15 @@ class AgentRegistry:
         This would typically be called when an agent is deployed.
         The manifest could come from a manifest.yaml file.
         """
-        if agent_id in self._registered_agents:
-            print(f"Agent {agent_id} already registered. Updating manifest.")
+        previous = self._registered_agents.get(agent_id)
         self._registered_agents[agent_id] = manifest
+        if previous is not None:
+            print(f"Agent {agent_id} already registered. Updating manifest.")
         print(f"Agent {agent_id} registered/updated.")
         return True
 
     def unregister_agent(self, agent_id: str) -> bool:
-        if agent_id in self._registered_agents:
-            del self._registered_agents[agent_id]
+        if self._registered_agents.pop(agent_id, None) is not None:
             print(f"Agent {agent_id} unregistered.")
             return True
         print(f"Agent {agent_id} not found for unregistration.")
@@ -45,12 +53,12 @@ class AgentRegistry:
 # Example Usage (conceptual)
 # if __name__ == "__main__":
 #     registry = AgentRegistry()
-#     sample_manifest = AgentManifest({
-#         "name": "WeatherBot",
-#         "version": "1.0.0",
-#         "description": "Provides weather information.",
-#         "triggers": [{"type": "keyword", "words": ["weather"]}],
-#         "skills": [{"name": "fetchWeather", "description": "Fetches weather from API"}]
-#     })
+#     sample_manifest = AgentManifest(
+#         name="WeatherBot",
+#         version="1.0.0",
+#         description="Provides weather information.",
+#         triggers=[{"type": "keyword", "words": ["weather"]}],
+#         skills=[{"name": "fetchWeather", "description": "Fetches weather from API"}]
+#     )
 #     registry.register_agent("weather_bot_v1", sample_manifest)
 #     print(registry.list_agents())
@@ -2,16 +2,20 @@
 # This module will define APIs and structures for managing agent memory,
 # both short-term (session-based) and long-term (vector DB for RAG).
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Set, Tuple, Union
 from abc import ABC, abstractmethod
+import time
+import numpy as np
+from pydantic import BaseModel, Field
 
-# Conceptual representation of a memory record
-class MemoryRecord(Dict[str, Any]): # Or a Pydantic model
+# Embeddings are float32 row vectors; plain float lists are accepted and converted once
+Embedding = Union[np.ndarray, List[float]]
+
+class MemoryRecord(BaseModel):
     """Represents a piece of information stored in memory."""
-    # timestamp: float
-    # content: Any
-    # metadata: Dict[str, Any]
-    pass
+    timestamp: float
+    content: Any
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 class ShortTermMemory(ABC):
     """Abstract base class for short-term memory (e.g., session memory)."""
@@ -41,8 +45,8 @@ class LongTermMemory(ABC):
         pass
 
     @abstractmethod
-    async def search_similar(self, query_embedding: List[float], top_k: int = 5) -> List[MemoryRecord]:
-        """Searches for documents similar to a given embedding."""
+    async def search_similar(self, query_embedding: Embedding, top_k: int = 5) -> List[MemoryRecord]:
+        """Searches for documents similar to a given embedding (float32 vector)."""
         pass
 
     @abstractmethod
@@ -62,21 +66,88 @@ class MemoryComponent:
     # Convenience methods can be added here that might choose between short/long term
     # or provide combined views.
 
-# Example (Conceptual - concrete implementations would be needed)
-# class InMemoryShortTermMemory(ShortTermMemory):
-#     def __init__(self):
-#         self.sessions_data: Dict[str, Dict[str, Any]] = {}
-#     async def store(self, session_id: str, key: str, value: Any) -> None:
-#         if session_id not in self.sessions_data:
-#             self.sessions_data[session_id] = {}
-#         self.sessions_data[session_id][key] = value
-#     async def retrieve(self, session_id: str, key: str) -> Optional[Any]:
-#         return self.sessions_data.get(session_id, {}).get(key)
-#     # ... other methods
+class InMemoryShortTermMemory(ShortTermMemory):
+    """
+    Process-local short-term memory.
+    Values live in one flat dict keyed by (session_id, key) so each store/retrieve
+    is a single hash probe; a per-session key index keeps list_keys O(session size).
+    """
+    def __init__(self):
+        self._data: Dict[Tuple[str, str], Any] = {}
+        self._session_keys: Dict[str, Set[str]] = {}
+
+    async def store(self, session_id: str, key: str, value: Any) -> None:
+        self._data[(session_id, key)] = value
+        self._session_keys.setdefault(session_id, set()).add(key)
+
+    async def retrieve(self, session_id: str, key: str) -> Optional[Any]:
+        return self._data.get((session_id, key))
+
+    async def delete(self, session_id: str, key: str) -> bool:
+        if (session_id, key) not in self._data:
+            return False
+        del self._data[(session_id, key)]
+        keys = self._session_keys[session_id]
+        keys.discard(key)
+        if not keys:
+            del self._session_keys[session_id]
+        return True
+
+    async def list_keys(self, session_id: str) -> List[str]:
+        return list(self._session_keys.get(session_id, ()))
+
+class FaissLongTermMemory(LongTermMemory):
+    """
+    Reference long-term memory backed by a FAISS HNSW index over float32 embeddings.
+    `embedder` maps a document to its embedding, so documents are added through the
+    plain `LongTermMemory.add_document(document, metadata)` call.
+    Document ids are the row positions in the index.
+    """
+    def __init__(self, dimension: int, embedder: Callable[[Any], Embedding], hnsw_neighbors: int = 32):
+        try:
+            import faiss  # Optional and heavy; imported only when this backend is used
+        except ImportError as e:
+            raise ImportError("FaissLongTermMemory requires the 'faiss-cpu' package") from e
+        self.dimension = dimension
+        self._embedder = embedder
+        self._index = faiss.IndexHNSWFlat(dimension, hnsw_neighbors)
+        self._records: List[MemoryRecord] = []
+
+    def _as_row(self, embedding: Embedding) -> np.ndarray:
+        row = np.ascontiguousarray(embedding, dtype=np.float32).reshape(1, -1)
+        if row.shape[1] != self.dimension:
+            raise ValueError(f"Expected embedding of dimension {self.dimension}, got {row.shape[1]}")
+        return row
+
+    async def add_document(self, document: Any, metadata: Optional[Dict[str, Any]] = None) -> str:
+        self._index.add(self._as_row(self._embedder(document)))
+        doc_id = str(len(self._records))
+        self._records.append(MemoryRecord(timestamp=time.time(), content=document, metadata=metadata or {}))
+        return doc_id
+
+    async def search_similar(self, query_embedding: Embedding, top_k: int = 5) -> List[MemoryRecord]:
+        if not self._records:
+            return []
+        distances, ids = self._index.search(self._as_row(query_embedding), min(top_k, len(self._records)))
+        results = []
+        for distance, row_id in zip(distances[0], ids[0]):
+            if row_id < 0:
+                continue
+            record = self._records[row_id]
+            results.append(record.model_copy(update={
+                "metadata": {**record.metadata, "doc_id": str(row_id), "distance": float(distance)}
+            }))
+        return results
+
+    async def get_document_by_id(self, doc_id: str) -> Optional[MemoryRecord]:
+        try:
+            return self._records[int(doc_id)]
+        except (ValueError, IndexError):
+            return None
 
 # if __name__ == "__main__":
-#     # This would require concrete implementations of ShortTermMemory and LongTermMemory
-#     # short_term_mem = InMemoryShortTermMemory()
+#     # This would require a concrete implementation of LongTermMemory
+#     short_term_mem = InMemoryShortTermMemory()
 #     # long_term_mem = SomeVectorDBClient()
 #     # memory_component = MemoryComponent(short_term_mem, long_term_mem)
 #     print("Memory module conceptual placeholders defined.")
@@ -2,19 +2,22 @@
 # This module will define how agent skills are represented and executed.
 # A skill is a specific capability or function that an agent can perform.
 
-from typing import Dict, Any, Callable, Awaitable, Optional
+from typing import Dict, Any, Callable, Awaitable, List, Optional
 from abc import ABC, abstractmethod
+from pydantic import BaseModel, ConfigDict
 
 # Context available to a skill during execution
-class SkillContext(Dict[str, Any]): # Or a Pydantic model
+class SkillContext(BaseModel):
     """
     Context provided to a skill during its execution.
     May include user information, session data, cultural context, etc.
+    Additional context values are kept as extra fields.
     """
-    # user_id: Optional[str]
-    # session_id: Optional[str]
-    # cultural_data: Optional[Dict[str, Any]]
-    pass
+    model_config = ConfigDict(extra="allow")
+
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    cultural_data: Optional[Dict[str, Any]] = None
 
 class Skill(ABC):
     """Abstract base class for an agent skill."""
@@ -52,7 +55,7 @@ class Skill(ABC):
 #     async def execute(self, args: Dict[str, Any], context: SkillContext) -> Any:
 #         city = args.get("city")
 #         if not city and context:
-#             city = context.get("user_location") # Example of using context
+#             city = getattr(context, "user_location", None) # Example of using context
 
 #         if not city:
 #             return {"error": "City not provided"}
@@ -66,28 +69,61 @@ class SkillRegistry:
     """Manages available skills for agents."""
     def __init__(self):
         self._skills: Dict[str, Skill] = {}
+        # Integer-id fast path: ids index straight into the bound `execute` coroutines
+        self._by_id: List[Callable[..., Awaitable[Any]]] = []
+        self._name_to_id: Dict[str, int] = {}
         print("SkillRegistry initialized (conceptual placeholder)")
 
     def register_skill(self, skill_instance: Skill):
-        if skill_instance.name in self._skills:
-            print(f"Skill '{skill_instance.name}' already registered. Overwriting.")
-        self._skills[skill_instance.name] = skill_instance
-        print(f"Skill '{skill_instance.name}' registered.")
+        skill_name = skill_instance.name
+        previous = self._skills.get(skill_name)
+        self._skills[skill_name] = skill_instance
+        if previous is not None:
+            print(f"Skill '{skill_name}' already registered. Overwriting.")
+            self._by_id[self._name_to_id[skill_name]] = skill_instance.execute
+        else:
+            self._name_to_id[skill_name] = len(self._by_id)
+            self._by_id.append(skill_instance.execute)
+        print(f"Skill '{skill_name}' registered.")
+
+    def get_skill_id(self, skill_name: str) -> Optional[int]:
+        """Returns the integer id for `execute_by_id`; callers look it up once and cache it."""
+        return self._name_to_id.get(skill_name)
 
     def get_skill(self, skill_name: str) -> Optional[Skill]:
         return self._skills.get(skill_name)
 
     async def execute_skill(self, skill_name: str, args: Dict[str, Any], context: SkillContext) -> Any:
-        skill_to_execute = self.get_skill(skill_name)
-        if not skill_to_execute:
+        skill_to_execute = self._skills.get(skill_name)
+        if skill_to_execute is None:
             return {"error": f"Skill '{skill_name}' not found."}
 
+        execute = getattr(skill_to_execute, "execute", None)
+        if execute is None:
+            return {"error": f"Skill '{skill_name}' has no execute method."}
+
         try:
-            return await skill_to_execute.execute(args, context)
+            return await execute(args, context)
         except Exception as e:
             print(f"Error executing skill '{skill_name}': {e}")
             return {"error": f"Error during skill execution: {str(e)}"}
 
+    async def execute_by_id(self, skill_id: int, args: Dict[str, Any], context: SkillContext) -> Any:
+        """Hot-path variant of execute_skill for callers holding an id from get_skill_id."""
+        if skill_id < 0:
+            # Negative ids would index from the end of the list
+            return {"error": f"Skill id {skill_id} not found."}
+        try:
+            execute = self._by_id[skill_id]
+        except IndexError:
+            return {"error": f"Skill id {skill_id} not found."}
+
+        try:
+            return await execute(args, context)
+        except Exception as e:
+            print(f"Error executing skill id {skill_id}: {e}")
+            return {"error": f"Error during skill execution: {str(e)}"}
+
 # if __name__ == "__main__":
 #     registry = SkillRegistry()
 #     weather_skill = FetchWeatherSkill()
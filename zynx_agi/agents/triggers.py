@@ -2,16 +2,24 @@
 # This module will define how agent triggers are specified and processed.
 # Triggers determine the conditions under which an agent is activated.
 
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
+import re
 from abc import ABC, abstractmethod
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-class TriggerContext(Dict[str, Any]): # Or a Pydantic model
+try:
+    import ahocorasick
+except ImportError:  # Optional; keyword matching falls back to a regex alternation
+    ahocorasick = None
+
+# Keyword lists longer than this are matched with a single Aho-Corasick pass
+AHOCORASICK_MIN_WORDS = 5
+
+class TriggerContext(BaseModel):
     """Contextual information available when evaluating a trigger."""
-    # incoming_message: Optional[str]
-    # webhook_payload: Optional[Dict[str, Any]]
-    # current_time: Optional[float]
-    pass
+    incoming_message: Optional[str] = None
+    webhook_payload: Optional[Dict[str, Any]] = None
+    current_time: Optional[float] = None
 
 class BaseTrigger(BaseModel, ABC):
     """Abstract base class for all trigger types."""
@@ -31,18 +39,34 @@ class KeywordTrigger(BaseTrigger):
     words: List[str] = Field(..., description="List of keywords to match.")
     case_sensitive: bool = False
 
+    _search_words: List[str] = PrivateAttr(default_factory=list)
+    _automaton: Any = PrivateAttr(default=None)
+    _pattern: Optional[re.Pattern] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Keyword preprocessing happens once here rather than on every evaluate()
+        self._search_words = self.words if self.case_sensitive else [word.lower() for word in self.words]
+        if ahocorasick is not None and len(self._search_words) > AHOCORASICK_MIN_WORDS:
+            automaton = ahocorasick.Automaton()
+            for word in self._search_words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._automaton = automaton
+        elif self._search_words:
+            # Words and text are lowercased up front, so no re.IGNORECASE per character
+            self._pattern = re.compile("|".join(re.escape(word) for word in self._search_words))
+
     async def evaluate(self, context: TriggerContext) -> bool:
-        incoming_message = context.get("incoming_message")
+        incoming_message = context.incoming_message
         if not isinstance(incoming_message, str):
             return False
 
         text_to_check = incoming_message if self.case_sensitive else incoming_message.lower()
 
-        for word in self.words:
-            keyword = word if self.case_sensitive else word.lower()
-            if keyword in text_to_check:
-                return True
-        return False
+        if self._automaton is not None:
+            return any(True for _ in self._automaton.iter(text_to_check))
+
+        return bool(self._pattern and self._pattern.search(text_to_check))
 
 class WebhookTrigger(BaseTrigger):
     """Triggers when an HTTP request is received at a specific endpoint."""
@@ -97,7 +121,7 @@ class TriggerManager:
 #     # schedule_trigger = ScheduleTrigger(cron_expression="* * * * *")
 
 #     # async def main():
-#     #     context = TriggerContext({"incoming_message": "Hello world!"})
+#     #     context = TriggerContext(incoming_message="Hello world!")
 #     #     print(f"Keyword trigger met: {await keyword_trigger.evaluate(context)}")
 
 #     #     manager = TriggerManager()
@@ -0,0 +1,28 @@
+from typing import Any
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Strong references so pending warm-up tasks are not garbage collected mid-flight
+_PREWARM_TASKS: set = set()
+
+async def _list_models(client: Any) -> None:
+    try:
+        await client.models.list()
+    except Exception as e:
+        logger.debug(f"Connection pre-warm failed: {str(e)}")
+
+def schedule_prewarm(client: Any) -> None:
+    """Open the pooled HTTPS connection in the background with a cheap models-list call.
+
+    Moves the TCP+TLS handshake off the first real request. Skipped when no event
+    loop is running (the first request then pays the handshake as before).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_list_models(client))
+    _PREWARM_TASKS.add(task)
+    task.add_done_callback(_PREWARM_TASKS.discard)
@@ -0,0 +1,103 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import functools
+
+# Static prompt fragments; only the message and context values are interpolated per call
+SYSTEM_PROMPT = "You are a culturally aware AI assistant. Respond appropriately while considering cultural context."
+_PROMPT_HEADER = (
+    "You are a culturally aware AI assistant. \n"
+    "        Respond appropriately to the following message while considering cultural context.\n"
+    "        \n"
+    "        Message: "
+)
+_PROMPT_MESSAGE_END = "\n        "
+_GUIDANCE_FORMALITY = (
+    "\n"
+    "            Cultural Context:\n"
+    "            - Formality Level: "
+)
+_GUIDANCE_POLITENESS = "\n            - Politeness Level: "
+_GUIDANCE_ELEMENTS = "\n            - Cultural Elements: "
+_GUIDANCE_END = (
+    "\n"
+    "            \n"
+    "            Please adjust your response to match these cultural parameters.\n"
+    "            "
+)
+
+@functools.lru_cache(maxsize=1024)
+def _build_prompt(message: str,
+                  formality: Any,
+                  politeness: Any,
+                  patterns: Optional[Tuple[str, ...]]) -> str:
+    if patterns is None:
+        return "".join((_PROMPT_HEADER, message, _PROMPT_MESSAGE_END))
+    return "".join((
+        _PROMPT_HEADER, message, _PROMPT_MESSAGE_END,
+        _GUIDANCE_FORMALITY, str(formality),
+        _GUIDANCE_POLITENESS, str(politeness),
+        _GUIDANCE_ELEMENTS, ", ".join(patterns),
+        _GUIDANCE_END
+    ))
+
+def build_cultural_prompt(message: str, cultural_context: Optional[Dict[str, Any]] = None) -> str:
+    """Culturally aware prompt text, memoized on the message and the context values it uses"""
+    if not cultural_context:
+        return _build_prompt(message, None, None, None)
+    return _build_prompt(
+        message,
+        cultural_context.get('formality_level', 0.7),
+        cultural_context.get('politeness_level', 0.8),
+        tuple(cultural_context.get('cultural_patterns', []))
+    )
+
+# Adjusted texts by (text, context_type), plus the in-flight engine calls for keys not yet cached
+_ADJUSTED_TEXT_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_ADJUSTED_TEXT_CACHE_SIZE = 1024
+_ADJUSTMENTS_IN_FLIGHT: Dict[Tuple[str, str], asyncio.Future] = {}
+
+async def adjust_cultural_text(cultural_engine: Any, text: str, context_type: str) -> str:
+    """Run `cultural_engine.process` once per distinct (text, context_type).
+
+    Concurrent identical calls await the same in-flight result instead of each
+    re-running the engine; completed results are kept in a bounded LRU.
+    """
+    key = (text, context_type)
+    cached = _ADJUSTED_TEXT_CACHE.get(key)
+    if cached is not None:
+        _ADJUSTED_TEXT_CACHE.move_to_end(key)
+        return cached
+
+    # Small-delta fast path: text already matches the register, skip the full engine pass
+    if cultural_engine.is_near_target(text, context_type):
+        return text
+
+    while (in_flight := _ADJUSTMENTS_IN_FLIGHT.get(key)) is not None:
+        try:
+            return await asyncio.shield(in_flight)
+        except asyncio.CancelledError:
+            if not in_flight.cancelled():
+                raise  # This caller was cancelled, not the one it was waiting on
+            # The leading call was cancelled; run the engine here instead
+
+    future = asyncio.get_running_loop().create_future()
+    _ADJUSTMENTS_IN_FLIGHT[key] = future
+    try:
+        processed = await cultural_engine.process({"text": text, "context_type": context_type})
+        adjusted_text = processed["adjusted_text"]
+    except asyncio.CancelledError:
+        future.cancel()  # Waiters retry rather than inherit this caller's cancellation
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved; only waiters (if any) re-raise it
+        raise
+    finally:
+        del _ADJUSTMENTS_IN_FLIGHT[key]
+
+    future.set_result(adjusted_text)
+    _ADJUSTED_TEXT_CACHE[key] = adjusted_text
+    if len(_ADJUSTED_TEXT_CACHE) > _ADJUSTED_TEXT_CACHE_SIZE:
+        _ADJUSTED_TEXT_CACHE.popitem(last=False)
+    return adjusted_text
@@ -0,0 +1,48 @@
+from typing import Optional
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """Client-side admission limiter: at most `rate` acquisitions per `period` seconds.
+
+    Callers queue locally once the expected RPM is used up instead of all sending
+    and tripping the provider's 429 together. Usage: `async with bucket: ...`.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        # Token throughput in the current one-minute window, reported from response.usage
+        self._tpm_window_start = self._updated
+        self.tokens_this_minute = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    def record_tokens(self, count: Optional[int]) -> None:
+        now = time.monotonic()
+        if now - self._tpm_window_start >= 60:
+            self._tpm_window_start = now
+            self.tokens_this_minute = 0
+        self.tokens_this_minute += count or 0
+
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
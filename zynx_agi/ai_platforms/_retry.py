@@ -0,0 +1,39 @@
+from typing import Optional
+import random
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested wait from `retry-after-ms` / `retry-after` headers, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            return float(retry_after)
+    except ValueError:  # HTTP-date form; fall back to computed backoff
+        pass
+    return None
+
+def backoff_delay(retry_count: int,
+                  error: Optional[Exception] = None,
+                  base: float = 1.0,
+                  max_delay: float = 30.0,
+                  full_jitter: bool = False) -> float:
+    """Seconds to sleep before retry number `retry_count`.
+
+    Honours Retry-After when the provider sent one; otherwise jittered exponential
+    backoff so concurrent callers hitting the same 429 do not retry in lockstep.
+    """
+    if error is not None:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(max_delay, max(0.0, retry_after))
+
+    ceiling = min(max_delay, base * 2 ** retry_count)
+    if full_jitter:
+        return random.uniform(0, ceiling)
+    return min(max_delay, ceiling * (0.5 + random.random()))
@@ -0,0 +1,191 @@
+from typing import Dict, Any, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from collections import deque
+import asyncio
+import io
+import itertools
+import json
+import logging
+
+from openai.types.chat import ChatCompletion
+
+logger = logging.getLogger(__name__)
+
+# Requests whose latency budget is at or below this go straight to the realtime endpoint
+REALTIME_BUDGET_MS = 5000
+
+class BatchDispatcher(ABC):
+    """Pools latency-tolerant requests from many coroutines into provider Batch API jobs.
+
+    `submit()` sends tight-budget requests to the realtime endpoint, through
+    `rate_limiter` (an `AsyncTokenBucket`) when one is given; everything else is
+    queued and flushed as one batch every `flush_interval` seconds or `max_batch_size`
+    requests, whichever comes first. Each caller awaits its own future.
+    """
+
+    def __init__(self,
+                 client: Any,
+                 max_batch_size: int = 100,
+                 flush_interval: float = 30.0,
+                 poll_interval: float = 30.0,
+                 rate_limiter: Optional[Any] = None):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self._queue: deque = deque()
+        self._ids = itertools.count()
+        self._flusher: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+        self._pending_jobs: set = set()
+
+    async def submit(self, latency_budget_ms: int, **create_kwargs) -> Any:
+        """Create a completion, through the Batch API when the latency budget allows it"""
+        if latency_budget_ms <= REALTIME_BUDGET_MS:
+            if self.rate_limiter is None:
+                return await self._create_realtime(**create_kwargs)
+            async with self.rate_limiter:
+                response = await self._create_realtime(**create_kwargs)
+            self.rate_limiter.record_tokens(self._prompt_tokens(response))
+            return response
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((f"req-{next(self._ids)}", create_kwargs, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        if len(self._queue) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _flush_loop(self) -> None:
+        while self._queue:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch_size))]
+            if len(self._queue) >= self.max_batch_size:
+                self._full.set()
+            if batch:
+                job = asyncio.create_task(self._run_batch(batch))
+                self._pending_jobs.add(job)
+                job.add_done_callback(self._pending_jobs.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        futures = {custom_id: future for custom_id, _, future in batch}
+        try:
+            batch_id = await self._create_batch([(custom_id, kwargs) for custom_id, kwargs, _ in batch])
+            while not await self._is_finished(batch_id):
+                await asyncio.sleep(self.poll_interval)
+            results = await self._collect_results(batch_id)
+        except Exception as e:
+            logger.error(f"Batch request failed: {str(e)}")
+            results = {custom_id: e for custom_id in futures}
+
+        for custom_id, future in futures.items():
+            if future.done():
+                continue
+            result = results.get(custom_id, RuntimeError(f"No batch result for {custom_id}"))
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @abstractmethod
+    async def _create_realtime(self, **create_kwargs) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _prompt_tokens(self, response: Any) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _create_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _is_finished(self, batch_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _collect_results(self, batch_id: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+class AnthropicBatchDispatcher(BatchDispatcher):
+    """Batch dispatcher for `AsyncAnthropic.messages.batches`"""
+
+    async def _create_realtime(self, **create_kwargs) -> Any:
+        return await self.client.messages.create(**create_kwargs)
+
+    def _prompt_tokens(self, response: Any) -> Optional[int]:
+        return response.usage.input_tokens
+
+    async def _create_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        batch = await self.client.messages.batches.create(
+            requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests]
+        )
+        return batch.id
+
+    async def _is_finished(self, batch_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def _collect_results(self, batch_id: str) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message
+            else:
+                results[entry.custom_id] = RuntimeError(f"Batch request {entry.custom_id} {entry.result.type}")
+        return results
+
+class OpenAIBatchDispatcher(BatchDispatcher):
+    """Batch dispatcher for `AsyncOpenAI.batches` over `/v1/chat/completions`"""
+
+    async def _create_realtime(self, **create_kwargs) -> Any:
+        return await self.client.chat.completions.create(**create_kwargs)
+
+    def _prompt_tokens(self, response: Any) -> Optional[int]:
+        return response.usage.prompt_tokens
+
+    async def _create_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        lines = "\n".join(
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests
+        )
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", io.BytesIO(lines.encode("utf-8"))),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def _is_finished(self, batch_id: str) -> bool:
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"Batch {batch_id} {batch.status}")
+        return batch.status == "completed"
+
+    async def _collect_results(self, batch_id: str) -> Dict[str, Any]:
+        batch = await self.client.batches.retrieve(batch_id)
+        results: Dict[str, Any] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line:
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[entry["custom_id"]] = ChatCompletion.model_validate(response["body"])
+                else:
+                    results[entry["custom_id"]] = RuntimeError(str(entry.get("error") or response.get("body")))
+        return results
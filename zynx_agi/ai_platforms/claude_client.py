@@ -1,113 +1,116 @@
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 import anthropic
 from anthropic import AsyncAnthropic
 import asyncio
+import functools
+import httpx
 import logging
-from datetime import datetime
-import json
 from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
+from ._prewarm import schedule_prewarm
+from ._prompting import SYSTEM_PROMPT, adjust_cultural_text, build_cultural_prompt
+from ._rate_limit import AsyncTokenBucket
+from ._retry import backoff_delay
+from .batch_dispatcher import AnthropicBatchDispatcher
 
 logger = logging.getLogger(__name__)
 
+# Exception class -> (error label, retryable), resolved along the exception's MRO
+_ERROR_HANDLING: Dict[type, Tuple[str, bool]] = {
+    anthropic.RateLimitError: ("Rate Limit Error", True),
+    anthropic.APITimeoutError: ("Timeout Error", True),
+    anthropic.APIError: ("API Error", True),
+}
+_UNKNOWN_ERROR = ("Unknown Error", False)
+
+# One SDK client (and httpx connection pool) per API key, shared by every instance
+_CLIENT_CACHE: Dict[Optional[str], AsyncAnthropic] = {}
+_RATE_LIMITERS: Dict[Optional[str], AsyncTokenBucket] = {}
+_BATCH_DISPATCHERS: Dict[Optional[str], AnthropicBatchDispatcher] = {}
+
+def _get_shared_client(api_key: Optional[str], max_connections: int, prewarm: bool = False) -> AsyncAnthropic:
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        # Pool sized well past the httpx default of 100 so gather() fan-outs are not queued locally
+        client = AsyncAnthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections * 3 // 4,
+                    keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(120.0)
+            )
+        )
+        _CLIENT_CACHE[api_key] = client
+        if prewarm:
+            schedule_prewarm(client)
+    return client
+
+async def aclose_shared_clients() -> None:
+    """Close every pooled AsyncAnthropic and its connections; for application shutdown"""
+    clients = list(_CLIENT_CACHE.values())
+    _CLIENT_CACHE.clear()
+    # Dispatchers hold a reference to their key's client, so they go too
+    _BATCH_DISPATCHERS.clear()
+    for client in clients:
+        await client.close()
+
+@functools.lru_cache(maxsize=8)
+def _static_capabilities(model: str, max_tokens: int) -> Dict[str, Any]:
+    # Capabilities do not change between requests, so they are not probed with a paid API call
+    return {
+        "model_name": model,
+        "max_tokens": max_tokens,
+        "supported_features": ["text_generation", "cultural_awareness"],
+        "cultural_awareness": True,
+        "language_support": ["en", "th"]
+    }
+
 class ClaudeClient:
     """Anthropic Claude client with cultural context awareness"""
     
     def __init__(self):
         self.settings = settings.ai
-        self.client = AsyncAnthropic(api_key=self.settings.ANTHROPIC_API_KEY)
+        self.client = _get_shared_client(
+            self.settings.ANTHROPIC_API_KEY,
+            self.settings.ANTHROPIC_MAX_CONNECTIONS,
+            prewarm=self.settings.PREWARM
+        )
+        self.rate_limiter = _RATE_LIMITERS.get(self.settings.ANTHROPIC_API_KEY)
+        if self.rate_limiter is None:
+            self.rate_limiter = _RATE_LIMITERS[self.settings.ANTHROPIC_API_KEY] = AsyncTokenBucket(self.settings.ANTHROPIC_RPM, 60)
         self.cultural_engine = ThaiCulturalEngine()
         self.model = self.settings.ANTHROPIC_MODEL
         self.max_tokens = self.settings.ANTHROPIC_MAX_TOKENS
         self.temperature = self.settings.ANTHROPIC_TEMPERATURE
-        self._capabilities = None
-        self._last_capability_check = None
         
     async def _check_capabilities(self) -> Dict[str, Any]:
-        """Check Claude's capabilities and cache the results"""
-        if (self._capabilities and self._last_capability_check and 
-            (datetime.now() - self._last_capability_check).seconds < 3600):
-            return self._capabilities
-            
-        try:
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0,
-                system="You are a capability reporting assistant. Report your capabilities in JSON format.",
-                messages=[{
-                    "role": "user",
-                    "content": "What are your capabilities? Report in JSON format with fields: model_name, max_tokens, supported_features, cultural_awareness, language_support."
-                }]
-            )
-            
-            capabilities = json.loads(response.content[0].text)
-            self._capabilities = capabilities
-            self._last_capability_check = datetime.now()
-            return capabilities
-            
-        except Exception as e:
-            logger.error(f"Error checking Claude capabilities: {str(e)}")
-            return {
-                "model_name": self.model,
-                "max_tokens": self.max_tokens,
-                "supported_features": ["text_generation", "cultural_awareness"],
-                "cultural_awareness": True,
-                "language_support": ["en", "th"]
-            }
+        """Report Claude's capabilities (static per model; no API round-trip)"""
+        return dict(_static_capabilities(self.model, self.max_tokens))
     
     def _create_cultural_prompt(self, 
                               message: str, 
                               cultural_context: Optional[Dict[str, Any]] = None) -> str:
         """Create a culturally aware prompt"""
-        base_prompt = f"""You are a culturally aware AI assistant. 
-        Respond appropriately to the following message while considering cultural context.
-        
-        Message: {message}
-        """
-        
-        if cultural_context:
-            cultural_guidance = f"""
-            Cultural Context:
-            - Formality Level: {cultural_context.get('formality_level', 0.7)}
-            - Politeness Level: {cultural_context.get('politeness_level', 0.8)}
-            - Cultural Elements: {', '.join(cultural_context.get('cultural_patterns', []))}
-            
-            Please adjust your response to match these cultural parameters.
-            """
-            base_prompt += cultural_guidance
-            
-        return base_prompt
+        return build_cultural_prompt(message, cultural_context)
     
-    async def _handle_error(self, error: Exception) -> Dict[str, Any]:
+    def _handle_error(self, error: Exception) -> Dict[str, Any]:
         """Handle different types of errors"""
-        error_type = type(error).__name__
-        error_message = str(error)
-        
-        if isinstance(error, anthropic.APIError):
-            return {
-                "error": "API Error",
-                "message": error_message,
-                "retryable": True
-            }
-        elif isinstance(error, anthropic.RateLimitError):
-            return {
-                "error": "Rate Limit Error",
-                "message": error_message,
-                "retryable": True
-            }
-        elif isinstance(error, anthropic.APITimeoutError):
-            return {
-                "error": "Timeout Error",
-                "message": error_message,
-                "retryable": True
-            }
+        # Most specific class wins, e.g. RateLimitError before its APIError base
+        for error_class in type(error).__mro__:
+            handling = _ERROR_HANDLING.get(error_class)
+            if handling is not None:
+                break
         else:
-            return {
-                "error": "Unknown Error",
-                "message": error_message,
-                "retryable": False
-            }
+            handling = _UNKNOWN_ERROR
+        error_label, retryable = handling
+        return {
+            "error": error_label,
+            "message": str(error),
+            "retryable": retryable
+        }
     
     async def _process_response(self, 
                               response: Any, 
@@ -119,11 +122,11 @@ class ClaudeClient:
             
             # Process with cultural engine if context provided
             if cultural_context:
-                processed = await self.cultural_engine.process_message({
-                    "text": response_text,
-                    "context_type": "formal" if cultural_context.get('formality_level', 0.7) > 0.7 else "informal"
-                })
-                response_text = processed["adjusted_text"]
+                response_text = await adjust_cultural_text(
+                    self.cultural_engine,
+                    response_text,
+                    "formal" if cultural_context.get('formality_level', 0.7) > 0.7 else "informal"
+                )
             
             return {
                 "text": response_text,
@@ -138,7 +141,7 @@ class ClaudeClient:
             
         except Exception as e:
             logger.error(f"Error processing response: {str(e)}")
-            return await self._handle_error(e)
+            return self._handle_error(e)
     
     async def generate_response(self, 
                               message: str, 
@@ -153,40 +156,92 @@ class ClaudeClient:
                 # Create culturally aware prompt
                 prompt = self._create_cultural_prompt(message, cultural_context)
                 
-                # Generate response
-                response = await self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    system="You are a culturally aware AI assistant. Respond appropriately while considering cultural context.",
-                    messages=[{
-                        "role": "user",
-                        "content": prompt
-                    }]
-                )
+                # Generate response, waiting locally if this key's RPM budget is spent
+                async with self.rate_limiter:
+                    response = await self.client.messages.create(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        system=SYSTEM_PROMPT,
+                        messages=[{
+                            "role": "user",
+                            "content": prompt
+                        }]
+                    )
+                self.rate_limiter.record_tokens(response.usage.input_tokens)
                 
                 # Process and return response
                 return await self._process_response(response, cultural_context)
                 
             except Exception as e:
                 last_error = e
-                error_info = await self._handle_error(e)
+                error_info = self._handle_error(e)
                 
                 if not error_info["retryable"]:
                     return error_info
                 
                 retry_count += 1
                 if retry_count < max_retries:
-                    await asyncio.sleep(2 ** retry_count)  # Exponential backoff
+                    await asyncio.sleep(backoff_delay(retry_count, e))
                 continue
         
         # If all retries failed
-        return await self._handle_error(last_error)
+        return self._handle_error(last_error)
     
+    async def stream_response(self,
+                              message: str,
+                              cultural_context: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Yield Claude's response text as it is generated.
+
+        Chunks are the raw model output; the cultural-engine adjustment applied by
+        generate_response needs the full text and is not applied here.
+        """
+        prompt = self._create_cultural_prompt(message, cultural_context)
+        async with self.rate_limiter:
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                system=SYSTEM_PROMPT,
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }]
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+    
+    async def batch_generate_response(self,
+                                    messages: List[str],
+                                    cultural_context: Optional[Dict[str, Any]] = None,
+                                    max_concurrent: int = 5,
+                                    batch_size: int = 100) -> List[Union[Dict[str, Any], BaseException]]:
+        """Generate responses for many messages concurrently, at most `max_concurrent` in flight"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def _one(message: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_response(message, cultural_context)
+
+        results: List[Union[Dict[str, Any], BaseException]] = []
+        # Slices bound how many pending coroutines exist at once
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            results.extend(await asyncio.gather(*(_one(m) for m in batch), return_exceptions=True))
+        return results
+
     async def get_capabilities(self) -> Dict[str, Any]:
         """Get Claude's capabilities"""
         return await self._check_capabilities()
     
+    async def submit(self, latency_budget_ms: int, **create_kwargs) -> Any:
+        """Run a raw `messages.create` request, pooled into the Batch API when the budget is over 5 s"""
+        api_key = self.settings.ANTHROPIC_API_KEY
+        dispatcher = _BATCH_DISPATCHERS.get(api_key)
+        if dispatcher is None:
+            dispatcher = _BATCH_DISPATCHERS[api_key] = AnthropicBatchDispatcher(self.client, rate_limiter=self.rate_limiter)
+        return await dispatcher.submit(latency_budget_ms, **create_kwargs)
+
     async def close(self):
-        """Close the client connection"""
-        await self.client.close() 
\ No newline at end of file
+        """No-op: the underlying connection pool is shared with other instances"""
+        return None 
\ No newline at end of file
@@ -1,71 +1,121 @@
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Union
 import openai
 from openai import AsyncOpenAI
 import asyncio
+import functools
+import httpx
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 import json
 import tiktoken
 from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
+from ._prewarm import schedule_prewarm
+from ._prompting import SYSTEM_PROMPT, adjust_cultural_text, build_cultural_prompt
+from ._rate_limit import AsyncTokenBucket
+from ._retry import backoff_delay
+from .batch_dispatcher import OpenAIBatchDispatcher
 
 logger = logging.getLogger(__name__)
 
+# Exception class -> (error label, retryable), resolved along the exception's MRO
+_ERROR_HANDLING: Dict[type, Tuple[str, bool]] = {
+    openai.RateLimitError: ("Rate Limit Error", True),
+    openai.APITimeoutError: ("Timeout Error", True),
+    openai.APIError: ("API Error", True),
+}
+_UNKNOWN_ERROR = ("Unknown Error", False)
+
+# One SDK client (and httpx connection pool) per API key, shared by every instance
+_CLIENT_CACHE: Dict[Optional[str], AsyncOpenAI] = {}
+_RATE_LIMITERS: Dict[Optional[str], AsyncTokenBucket] = {}
+_BATCH_DISPATCHERS: Dict[Optional[str], OpenAIBatchDispatcher] = {}
+
+def _get_shared_client(api_key: Optional[str], max_connections: int, prewarm: bool = False) -> AsyncOpenAI:
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        # Pool sized well past the httpx default of 100 so gather() fan-outs are not queued locally
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections * 3 // 4,
+                    keepalive_expiry=30.0
+                ),
+                timeout=httpx.Timeout(120.0)
+            )
+        )
+        _CLIENT_CACHE[api_key] = client
+        if prewarm:
+            schedule_prewarm(client)
+    return client
+
+async def aclose_shared_clients() -> None:
+    """Close every pooled AsyncOpenAI and its connections; for application shutdown"""
+    clients = list(_CLIENT_CACHE.values())
+    _CLIENT_CACHE.clear()
+    # Dispatchers hold a reference to their key's client, so they go too
+    _BATCH_DISPATCHERS.clear()
+    for client in clients:
+        await client.close()
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    # Registry lookup and BPE table load happen once per model, not per OpenAIClient
+    return tiktoken.encoding_for_model(model)
+
+@functools.lru_cache(maxsize=1024)
+def _cached_token_count(encoding: tiktoken.Encoding, text: str) -> int:
+    # Repeated strings (system prompt, prompt headers) are counted once
+    return len(encoding.encode(text))
+
 class OpenAIClient:
     """OpenAI client with cultural context integration and optimization"""
     
     def __init__(self):
         self.settings = settings.ai
-        self.client = AsyncOpenAI(api_key=self.settings.OPENAI_API_KEY)
+        self.client = _get_shared_client(
+            self.settings.OPENAI_API_KEY,
+            self.settings.OPENAI_MAX_CONNECTIONS,
+            prewarm=self.settings.PREWARM
+        )
+        self.rate_limiter = _RATE_LIMITERS.get(self.settings.OPENAI_API_KEY)
+        if self.rate_limiter is None:
+            self.rate_limiter = _RATE_LIMITERS[self.settings.OPENAI_API_KEY] = AsyncTokenBucket(self.settings.OPENAI_RPM, 60)
         self.cultural_engine = ThaiCulturalEngine()
         self.model = self.settings.OPENAI_MODEL
         self.max_tokens = self.settings.OPENAI_MAX_TOKENS
         self.temperature = self.settings.OPENAI_TEMPERATURE
-        self.encoding = tiktoken.encoding_for_model(self.model)
+        self.encoding = _get_encoding(self.model)
         self._token_usage_stats = {
             "total_tokens": 0,
             "prompt_tokens": 0,
             "completion_tokens": 0,
-            "last_reset": datetime.now()
+            "last_reset": time.monotonic()  # Monotonic; converted to wall-clock time in get_token_usage
         }
         
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken"""
-        return len(self.encoding.encode(text))
+        return _cached_token_count(self.encoding, text)
     
     def _optimize_prompt(self, prompt: str, max_tokens: int) -> str:
         """Optimize prompt to fit within token limit"""
-        tokens = self._count_tokens(prompt)
-        if tokens <= max_tokens:
+        # Encode once and cut at the token limit instead of re-encoding per dropped word
+        ids = self.encoding.encode(prompt)
+        if len(ids) <= max_tokens:
             return prompt
-            
-        # Truncate prompt while preserving meaning
-        words = prompt.split()
-        while self._count_tokens(" ".join(words)) > max_tokens and words:
-            words.pop()
-        return " ".join(words)
+        # A cut can land inside a multi-byte character (common in Thai); drop the partial
+        # bytes instead of letting decode() append a U+FFFD replacement character
+        return self.encoding.decode_bytes(ids[:max_tokens]).decode("utf-8", errors="ignore")
     
     def _create_cultural_prompt(self, 
                               message: str, 
                               cultural_context: Optional[Dict[str, Any]] = None,
                               max_tokens: Optional[int] = None) -> str:
         """Create a culturally aware prompt with token optimization"""
-        base_prompt = f"""You are a culturally aware AI assistant. 
-        Respond appropriately to the following message while considering cultural context.
-        
-        Message: {message}
-        """
-        
-        if cultural_context:
-            cultural_guidance = f"""
-            Cultural Context:
-            - Formality Level: {cultural_context.get('formality_level', 0.7)}
-            - Politeness Level: {cultural_context.get('politeness_level', 0.8)}
-            - Cultural Elements: {', '.join(cultural_context.get('cultural_patterns', []))}
-            
-            Please adjust your response to match these cultural parameters.
-            """
-            base_prompt += cultural_guidance
+        base_prompt = build_cultural_prompt(message, cultural_context)
         
         if max_tokens:
             base_prompt = self._optimize_prompt(base_prompt, max_tokens)
@@ -79,43 +129,29 @@ class OpenAIClient:
         self._token_usage_stats["completion_tokens"] += usage.get("completion_tokens", 0)
         
         # Reset stats if more than 24 hours have passed
-        if (datetime.now() - self._token_usage_stats["last_reset"]).days >= 1:
+        if time.monotonic() - self._token_usage_stats["last_reset"] >= 86400:
             self._token_usage_stats = {
                 "total_tokens": usage.get("total_tokens", 0),
                 "prompt_tokens": usage.get("prompt_tokens", 0),
                 "completion_tokens": usage.get("completion_tokens", 0),
-                "last_reset": datetime.now()
+                "last_reset": time.monotonic()
             }
     
-    async def _handle_error(self, error: Exception) -> Dict[str, Any]:
+    def _handle_error(self, error: Exception) -> Dict[str, Any]:
         """Handle different types of errors"""
-        error_type = type(error).__name__
-        error_message = str(error)
-        
-        if isinstance(error, openai.APIError):
-            return {
-                "error": "API Error",
-                "message": error_message,
-                "retryable": True
-            }
-        elif isinstance(error, openai.RateLimitError):
-            return {
-                "error": "Rate Limit Error",
-                "message": error_message,
-                "retryable": True
-            }
-        elif isinstance(error, openai.APITimeoutError):
-            return {
-                "error": "Timeout Error",
-                "message": error_message,
-                "retryable": True
-            }
+        # Most specific class wins, e.g. RateLimitError before its APIError base
+        for error_class in type(error).__mro__:
+            handling = _ERROR_HANDLING.get(error_class)
+            if handling is not None:
+                break
         else:
-            return {
-                "error": "Unknown Error",
-                "message": error_message,
-                "retryable": False
-            }
+            handling = _UNKNOWN_ERROR
+        error_label, retryable = handling
+        return {
+            "error": error_label,
+            "message": str(error),
+            "retryable": retryable
+        }
     
     async def _process_response(self, 
                               response: Any, 
@@ -127,11 +163,11 @@ class OpenAIClient:
             
             # Process with cultural engine if context provided
             if cultural_context:
-                processed = await self.cultural_engine.process_message({
-                    "text": response_text,
-                    "context_type": "formal" if cultural_context.get('formality_level', 0.7) > 0.7 else "informal"
-                })
-                response_text = processed["adjusted_text"]
+                response_text = await adjust_cultural_text(
+                    self.cultural_engine,
+                    response_text,
+                    "formal" if cultural_context.get('formality_level', 0.7) > 0.7 else "informal"
+                )
             
             # Update token usage
             usage = {
@@ -150,7 +186,7 @@ class OpenAIClient:
             
         except Exception as e:
             logger.error(f"Error processing response: {str(e)}")
-            return await self._handle_error(e)
+            return self._handle_error(e)
     
     async def generate_response(self, 
                               message: str, 
@@ -171,48 +207,114 @@ class OpenAIClient:
                 # Create culturally aware prompt
                 prompt = self._create_cultural_prompt(message, cultural_context, tokens)
                 
-                # Generate response
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    max_tokens=tokens,
-                    temperature=temp,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a culturally aware AI assistant. Respond appropriately while considering cultural context."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                )
+                # Generate response, waiting locally if this key's RPM budget is spent
+                async with self.rate_limiter:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        max_tokens=tokens,
+                        temperature=temp,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": SYSTEM_PROMPT
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    )
+                self.rate_limiter.record_tokens(response.usage.prompt_tokens)
                 
                 # Process and return response
                 return await self._process_response(response, cultural_context)
                 
             except Exception as e:
                 last_error = e
-                error_info = await self._handle_error(e)
+                error_info = self._handle_error(e)
                 
                 if not error_info["retryable"]:
                     return error_info
                 
                 retry_count += 1
                 if retry_count < max_retries:
-                    await asyncio.sleep(2 ** retry_count)  # Exponential backoff
+                    await asyncio.sleep(backoff_delay(retry_count, e))
                 continue
         
         # If all retries failed
-        return await self._handle_error(last_error)
+        return self._handle_error(last_error)
     
+    async def stream_response(self,
+                              message: str,
+                              cultural_context: Optional[Dict[str, Any]] = None,
+                              temperature: Optional[float] = None,
+                              max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield OpenAI's response text as it is generated.
+
+        Chunks are the raw model output; the cultural-engine adjustment applied by
+        generate_response needs the full text and is not applied here.
+        """
+        tokens = max_tokens if max_tokens is not None else self.max_tokens
+        prompt = self._create_cultural_prompt(message, cultural_context, tokens)
+        async with self.rate_limiter:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                max_tokens=tokens,
+                temperature=temperature if temperature is not None else self.temperature,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                stream=True
+            )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    async def batch_generate_response(self,
+                                    messages: List[str],
+                                    cultural_context: Optional[Dict[str, Any]] = None,
+                                    max_concurrent: int = 5,
+                                    batch_size: int = 100) -> List[Union[Dict[str, Any], BaseException]]:
+        """Generate responses for many messages concurrently, at most `max_concurrent` in flight"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def _one(message: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_response(message, cultural_context)
+
+        results: List[Union[Dict[str, Any], BaseException]] = []
+        # Slices bound how many pending coroutines exist at once
+        for start in range(0, len(messages), batch_size):
+            batch = messages[start:start + batch_size]
+            results.extend(await asyncio.gather(*(_one(m) for m in batch), return_exceptions=True))
+        return results
+
     def get_token_usage(self) -> Dict[str, Any]:
         """Get current token usage statistics"""
+        since_reset = timedelta(seconds=time.monotonic() - self._token_usage_stats["last_reset"])
         return {
-            "stats": self._token_usage_stats,
-            "time_since_reset": str(datetime.now() - self._token_usage_stats["last_reset"])
+            "stats": {
+                **self._token_usage_stats,
+                "last_reset": (datetime.now() - since_reset).isoformat()
+            },
+            "time_since_reset": str(since_reset)
         }
     
+    async def submit(self, latency_budget_ms: int, **create_kwargs) -> Any:
+        """Run a raw `chat.completions.create` request, pooled into the Batch API when the budget is over 5 s"""
+        api_key = self.settings.OPENAI_API_KEY
+        dispatcher = _BATCH_DISPATCHERS.get(api_key)
+        if dispatcher is None:
+            dispatcher = _BATCH_DISPATCHERS[api_key] = OpenAIBatchDispatcher(self.client, rate_limiter=self.rate_limiter)
+        return await dispatcher.submit(latency_budget_ms, **create_kwargs)
+
     async def close(self):
-        """Close the client connection"""
-        await self.client.close() 
\ No newline at end of file
+        """No-op: the underlying connection pool is shared with other instances"""
+        return None 
\ No newline at end of file
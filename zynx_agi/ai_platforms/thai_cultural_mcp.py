@@ -1,12 +1,26 @@
-from typing import Dict, Any, List, Optional
-from fastapi import FastAPI, HTTPException, Depends, Form
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import time
+from fastapi import FastAPI, HTTPException, Depends, Form, Response
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
+import json
 import jwt
 from datetime import datetime, timedelta
 from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
 
+try:
+    import orjson
+except ImportError:  # Optional; falls back to stdlib json
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Thai Cultural MCP Server",
@@ -17,14 +31,34 @@ app = FastAPI(
 # Initialize Thai Cultural Engine
 cultural_engine = ThaiCulturalEngine()
 
+# The engine's pattern tables are static, so /cultural/resources is serialized once here
+_RESOURCES_JSON = _dumps([
+    {"type": "cultural_patterns", "data": dict(cultural_engine.cultural_patterns)},
+    {"type": "formal_patterns", "data": dict(cultural_engine.formal_patterns)},
+    {"type": "polite_particles", "data": dict(cultural_engine.polite_particles)}
+])
+_PROMPTS = [
+    "วิเคราะห์บริบททางวัฒนธรรมของข้อความ",
+    "ปรับแต่งข้อความให้เหมาะสมกับบริบททางวัฒนธรรม",
+    "ให้คำแนะนำในการปรับปรุงการสื่อสารทางวัฒนธรรม"
+]
+_STATIC_CACHE_HEADERS = {"Cache-Control": "private, max-age=3600"}
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Verified tokens -> (TokenData, exp epoch seconds); a hit skips HS256 verification
+_TOKEN_CACHE: "OrderedDict[str, Tuple[TokenData, float]]" = OrderedDict()
+_TOKEN_CACHE_SIZE = 10000
+
 # Models
 class CulturalAnalysisRequest(BaseModel):
     text: str
     context: Optional[Dict[str, Any]] = None
 
+class CulturalAnalysisBatchRequest(BaseModel):
+    texts: List[str]
+
 class CulturalAnalysisResponse(BaseModel):
     formality_level: float
     politeness_level: float
@@ -54,6 +88,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cached = _TOKEN_CACHE.get(token)
+    if cached is not None:
+        token_data, expires_at = cached
+        if time.time() < expires_at:
+            return token_data
+        del _TOKEN_CACHE[token]
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         username: str = payload.get("sub")
@@ -62,6 +103,12 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         token_data = TokenData(username=username)
     except jwt.exceptions.PyJWTError: # Corrected exception type
         raise credentials_exception
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        _TOKEN_CACHE[token] = (token_data, float(expires_at))
+        if len(_TOKEN_CACHE) > _TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
     return token_data
 
 # MCP Endpoints
@@ -84,10 +131,12 @@ async def analyze_cultural_context(
 ):
     """Analyze Thai cultural context of text"""
     try:
-        # Analyze text using cultural engine
-        formality = cultural_engine.analyze_formality(request.text)
-        particles, politeness = cultural_engine.analyze_polite_particles(request.text)
-        patterns = cultural_engine.detect_cultural_patterns(request.text)
+        # Analyze text using cultural engine, off the event loop and concurrently
+        formality, (particles, politeness), patterns = await asyncio.gather(
+            asyncio.to_thread(cultural_engine.analyze_formality, request.text),
+            asyncio.to_thread(cultural_engine.analyze_polite_particles, request.text),
+            asyncio.to_thread(cultural_engine.detect_cultural_patterns, request.text)
+        )
         suggestions = cultural_engine.generate_cultural_suggestions(
             formality, politeness, patterns
         )
@@ -98,11 +147,35 @@ async def analyze_cultural_context(
             cultural_elements=patterns,
             suggestions=suggestions,
             detected_particles=particles,
-            cultural_patterns=list(patterns.keys())
+            cultural_patterns=list(patterns)
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _analyze_text(text: str) -> CulturalAnalysisResponse:
+    formality = cultural_engine.analyze_formality(text)
+    particles, politeness = cultural_engine.analyze_polite_particles(text)
+    patterns = cultural_engine.detect_cultural_patterns(text)
+    return CulturalAnalysisResponse(
+        formality_level=formality,
+        politeness_level=politeness,
+        cultural_elements=patterns,
+        suggestions=cultural_engine.generate_cultural_suggestions(formality, politeness, patterns),
+        detected_particles=particles,
+        cultural_patterns=list(patterns)
+    )
+
+@app.post("/api/v1/cultural/analyze_batch", response_model=List[CulturalAnalysisResponse])
+async def analyze_cultural_context_batch(
+    request: CulturalAnalysisBatchRequest,
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Analyze many texts in one request; results are in input order"""
+    try:
+        return await asyncio.to_thread(lambda: [_analyze_text(text) for text in request.texts])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/v1/cultural/adjust")
 async def adjust_cultural_context(
     request: CulturalAnalysisRequest,
@@ -125,26 +198,17 @@ async def get_cultural_resources(
     current_user: TokenData = Depends(get_current_user)
 ):
     """Get available cultural resources"""
-    # Returning a list of dictionaries for more structured data
-    resources = [
-        {"type": "cultural_patterns", "data": cultural_engine.cultural_patterns},
-        {"type": "formal_patterns", "data": cultural_engine.formal_patterns},
-        {"type": "polite_particles", "data": cultural_engine.polite_particles}
-    ]
-    return resources
+    return Response(content=_RESOURCES_JSON, media_type="application/json", headers=_STATIC_CACHE_HEADERS)
 
 # MCP Prompt endpoints
 @app.get("/api/v1/cultural/prompts", response_model=List[str])
 async def get_cultural_prompts(
+    response: Response,
     current_user: TokenData = Depends(get_current_user)
 ):
     """Get available cultural prompts"""
-    prompts = [
-        "วิเคราะห์บริบททางวัฒนธรรมของข้อความ",
-        "ปรับแต่งข้อความให้เหมาะสมกับบริบททางวัฒนธรรม",
-        "ให้คำแนะนำในการปรับปรุงการสื่อสารทางวัฒนธรรม"
-    ]
-    return prompts
+    response.headers.update(_STATIC_CACHE_HEADERS)
+    return _PROMPTS
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,17 +1,32 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel, Field, validator
-from typing import Dict, Any, List, Optional, Union, Literal
-import json
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_serializer, validator
+from typing import Dict, Any, List, Optional, Set, Tuple, Union, Literal
+import hashlib
 import logging
 import asyncio
+from collections import defaultdict
+import random
+import time
 from datetime import datetime
 from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
-from ..ai_platforms.openai_client import OpenAIClient
-from ..ai_platforms.claude_client import ClaudeClient
+from ..core.cache import TTLCache
+from ..ai_platforms.openai_client import OpenAIClient, aclose_shared_clients as aclose_openai_clients
+from ..ai_platforms.claude_client import ClaudeClient, aclose_shared_clients as aclose_claude_clients
 from ..ai_platforms.thai_cultural_mcp import get_current_user, TokenData
 import httpx
 
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    from json import dumps as _dumps, loads as _loads
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Optional; broadcasts stay process-local without it
+    aioredis = None
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -47,15 +62,28 @@ class WebSocketMessage(BaseModel):
     """WebSocket message model"""
     type: Literal["message", "typing", "error", "system"] = Field(..., description="Message type")
     content: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: float = Field(default_factory=time.time)  # Epoch seconds; ISO 8601 when serialized
+
+    @field_serializer("timestamp")
+    def serialize_timestamp(self, timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).isoformat()
+
+# Redis channel every worker publishes broadcasts to and fans out from
+BROADCAST_CHANNEL = "ws:broadcast"
 
 # WebSocket Connection Manager
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.user_sessions: Dict[str, Dict[str, Any]] = {}
+        # Room -> member client ids, and the reverse index for cleanup on disconnect
+        self.rooms: Dict[str, Set[str]] = defaultdict(set)
+        self._client_rooms: Dict[str, Set[str]] = defaultdict(set)
+        # Set by start_pubsub(); broadcasts then go through Redis to every worker
+        self._redis = None
+        self._subscriber: Optional[asyncio.Task] = None
         
-    async def connect(self, websocket: WebSocket, client_id: str):
+    async def connect(self, websocket: WebSocket, client_id: str, room: Optional[str] = None):
         await websocket.accept()
         self.active_connections[client_id] = websocket
         self.user_sessions[client_id] = {
@@ -63,109 +91,405 @@ class ConnectionManager:
             "message_count": 0,
             "last_message": None
         }
+        if room is not None:
+            self.join_room(client_id, room)
+        
+    def join_room(self, client_id: str, room: str):
+        self.rooms[room].add(client_id)
+        self._client_rooms[client_id].add(room)
+        
+    def leave_room(self, client_id: str, room: str):
+        members = self.rooms.get(room)
+        if members is not None:
+            members.discard(client_id)
+            if not members:
+                del self.rooms[room]
+        client_rooms = self._client_rooms.get(client_id)
+        if client_rooms is not None:
+            client_rooms.discard(room)
         
     def disconnect(self, client_id: str):
         if client_id in self.active_connections:
             del self.active_connections[client_id]
         if client_id in self.user_sessions:
             del self.user_sessions[client_id]
+        for room in self._client_rooms.pop(client_id, ()):
+            self.leave_room(client_id, room)
             
     async def send_message(self, client_id: str, message: WebSocketMessage):
         if client_id in self.active_connections:
-            await self.active_connections[client_id].send_json(message.dict())
+            await self.active_connections[client_id].send_text(message.model_dump_json())
             if client_id in self.user_sessions:
                 self.user_sessions[client_id]["message_count"] += 1
                 self.user_sessions[client_id]["last_message"] = datetime.now()
             
-    async def broadcast(self, message: WebSocketMessage, exclude: Optional[str] = None):
-        for client_id, connection in self.active_connections.items():
-            if client_id != exclude:
-                await connection.send_json(message.dict())
+    async def broadcast(self,
+                        message: WebSocketMessage,
+                        exclude: Optional[str] = None,
+                        room: Optional[str] = None):
+        """Send to every connection, or only to the members of `room` when given"""
+        # Serialize once and send to every recipient concurrently
+        payload = message.model_dump_json()
+        if self._redis is not None:
+            # Every worker (this one included) receives it and fans out to its own sockets
+            await self._redis.publish(
+                BROADCAST_CHANNEL,
+                _dumps({"payload": payload, "exclude": exclude, "room": room})
+            )
+            return
+        await self._broadcast_local(payload, exclude, room)
+        
+    async def _broadcast_local(self, payload: str, exclude: Optional[str], room: Optional[str]):
+        """Send a serialized message to the matching connections of this worker"""
+        if room is None:
+            candidates = self.active_connections.items()
+        else:
+            candidates = (
+                (client_id, self.active_connections[client_id])
+                for client_id in self.rooms.get(room, ())
+                if client_id in self.active_connections
+            )
+        recipients = [
+            (client_id, connection)
+            for client_id, connection in candidates
+            if client_id != exclude
+        ]
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for _, connection in recipients),
+            return_exceptions=True
+        )
+        for (client_id, _), result in zip(recipients, results):
+            if isinstance(result, Exception):
+                self.disconnect(client_id)
                 
     def get_session_stats(self, client_id: str) -> Optional[Dict[str, Any]]:
         return self.user_sessions.get(client_id)
+        
+    async def start_pubsub(self, redis_url: str):
+        """Relay broadcasts through Redis Pub/Sub so they reach sockets on every worker"""
+        if aioredis is None:
+            raise RuntimeError("redis is required for cross-worker broadcasts")
+        if self._redis is not None:
+            return
+        client = aioredis.from_url(redis_url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(BROADCAST_CHANNEL)
+        self._redis = client
+        self._subscriber = asyncio.create_task(self._relay(pubsub))
+        
+    async def stop_pubsub(self):
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            try:
+                await self._subscriber
+            except asyncio.CancelledError:
+                pass
+            self._subscriber = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            
+    async def _relay(self, pubsub):
+        try:
+            async for item in pubsub.listen():
+                if item["type"] != "message":
+                    continue
+                try:
+                    envelope = _loads(item["data"])
+                    await self._broadcast_local(envelope["payload"], envelope["exclude"], envelope["room"])
+                except Exception as e:
+                    logger.error(f"Error relaying broadcast: {str(e)}")
+        finally:
+            await pubsub.aclose()
 
 manager = ConnectionManager()
 
 # AI Client Factory
+# One long-lived client per provider, created on first use and closed at shutdown
+_ai_clients: Dict[str, Union[OpenAIClient, ClaudeClient]] = {}
+
 def get_ai_client(model: Optional[str] = None) -> Union[OpenAIClient, ClaudeClient]:
     """Get appropriate AI client based on model selection"""
-    if model == "claude":
-        return ClaudeClient()
-    return OpenAIClient()  # Default to OpenAI
+    provider = "claude" if model == "claude" else "openai"  # Default to OpenAI
+    client = _ai_clients.get(provider)
+    if client is None:
+        client = ClaudeClient() if provider == "claude" else OpenAIClient()
+        _ai_clients[provider] = client
+    return client
+
+@router.on_event("shutdown")
+async def close_ai_clients():
+    for client in _ai_clients.values():
+        await client.close()
+    _ai_clients.clear()
+    # Instance close() is a no-op; the pooled SDK clients behind them are closed here
+    await aclose_openai_clients()
+    await aclose_claude_clients()
+
+# Response caches for repeated inputs; entries live 10 minutes
+_response_cache = TTLCache(maxsize=10_000, ttl=600)
+_chat_cache = TTLCache(maxsize=10_000, ttl=600)
+# Cultural engine output per (text, context_type); shared read-only between requests
+_engine_cache = TTLCache(maxsize=10_000, ttl=600)
+# Requests currently being generated, so concurrent duplicates share one model call
+_inflight: Dict[str, asyncio.Future] = {}
+
+def _cache_key(*parts: Any) -> str:
+    """sha256 over the request fields; message text is whitespace-normalized first"""
+    return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split())
 
 async def process_message_with_cultural_context(
     message: ChatMessage,
     client: Union[OpenAIClient, ClaudeClient]
 ) -> Dict[str, Any]:
-    """Process message with cultural context and generate response"""
-    # Process with cultural context
-    if message.context:
-        processed_context = await cultural_engine.process_message({
+    """Process message with cultural context and generate response, cached per request"""
+    # Messages are single-turn, so the supplied cultural context is the whole conversation state
+    key = _cache_key(
+        message.model,
+        _normalize_text(message.text),
+        message.temperature,
+        message.max_tokens,
+        message.context.model_dump_json() if message.context else ""
+    )
+    cached = _response_cache.get(key)
+    if cached is not None:
+        response, message.text, message.context = cached
+        return response
+
+    while (inflight := _inflight.get(key)) is not None:
+        try:
+            response, message.text, message.context = await asyncio.shield(inflight)
+            return response
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise  # This caller was cancelled, not the one it was waiting on
+            # The leading request was cancelled (its client went away); run the call here instead
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        response = await _process_message_with_cultural_context(message, client)
+    except asyncio.CancelledError:
+        future.cancel()  # Duplicates retry rather than inherit this caller's cancellation
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved; only duplicate waiters (if any) re-raise it
+        raise
+    finally:
+        del _inflight[key]
+
+    result = (response, message.text, message.context)
+    future.set_result(result)
+    if "error" not in response:
+        _response_cache.set(key, result)
+    return response
+
+async def _apply_cultural_context(message: ChatMessage) -> Optional[Dict[str, Any]]:
+    """Adjust the message text and context with the cultural engine, in place.
+
+    Returns the cultural context as the dict the AI clients take.
+    """
+    context = message.context
+    if not context:
+        return None
+    formality_level = context.formality_level
+    if max(formality_level, context.politeness_level) < settings.DEFAULT_CULTURAL_THRESHOLD:
+        # Low-signal context: nothing for the engine to adjust, pass the text through
+        return context.model_dump()
+    context_type = "formal" if formality_level > 0.7 else "informal"
+    engine_key = (message.text, context_type)
+    processed_context = _engine_cache.get(engine_key)
+    if processed_context is None:
+        processed_context = await cultural_engine.process({
             "text": message.text,
-            "context_type": "formal" if message.context["formality_level"] > 0.7 else "informal"
+            "context_type": context_type
         })
-        message.text = processed_context["adjusted_text"]
-        message.context = CulturalContext(**processed_context["cultural_context"])
+        _engine_cache.set(engine_key, processed_context)
+    message.text = processed_context["adjusted_text"]
+    # The engine's own output needs no re-validation; its dict goes to the client as is
+    cultural_context = processed_context["cultural_context"]
+    message.context = CulturalContext.model_construct(**cultural_context)
+    return cultural_context
+
+async def _process_message_with_cultural_context(
+    message: ChatMessage,
+    client: Union[OpenAIClient, ClaudeClient]
+) -> Dict[str, Any]:
+    # Process with cultural context
+    cultural_context = await _apply_cultural_context(message)
     
     # Generate response
     return await client.generate_response(
         message=message.text,
-        cultural_context=message.context.dict() if message.context else None,
+        cultural_context=cultural_context,
         temperature=message.temperature,
         max_tokens=message.max_tokens
     )
 
 # MCP Client
+MCP_MAX_CONCURRENCY = 20
+MCP_MAX_ATTEMPTS = 4
+MCP_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+# Analyze calls arriving within this window are sent as one /analyze_batch request
+MCP_BATCH_WINDOW = 0.01
+MCP_MAX_BATCH = 64
+
 class ThaiCulturalMCPClient:
     def __init__(self):
         self.base_url = "http://localhost:8001"
         self.token = None
+        self._token_expires_at = 0.0
+        # Single-flight: concurrent cold requests share one POST /token
+        self._refresh_lock = asyncio.Lock()
+        # Caps in-flight MCP requests so bursts queue here instead of swamping the server
+        self._sem = asyncio.Semaphore(MCP_MAX_CONCURRENCY)
+        self._analyze_queue: List[Tuple[str, asyncio.Future]] = []
+        self._analyze_flusher: Optional[asyncio.Task] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # One pooled client for every MCP call, so requests reuse kept-alive connections
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+            timeout=httpx.Timeout(10.0)
+        )
     
-    async def login(self):
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/token",
-                data={"username": "admin", "password": "password"}
-            )
-            if response.status_code == 200:
-                self.token = response.json()["access_token"]
+    def _token_is_fresh(self) -> bool:
+        return bool(self.token) and time.time() < self._token_expires_at - 30
+    
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send with bounded concurrency, retrying transport errors and 429/5xx with jittered backoff"""
+        for attempt in range(MCP_MAX_ATTEMPTS):
+            last_attempt = attempt == MCP_MAX_ATTEMPTS - 1
+            try:
+                async with self._sem:
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
             else:
-                raise HTTPException(status_code=401, detail="Failed to authenticate with MCP server")
+                if response.status_code not in MCP_RETRYABLE_STATUS or last_attempt:
+                    return response
+            await asyncio.sleep(2 ** attempt * 0.25 + random.random())
+    
+    async def login(self):
+        response = await self._send(
+            "POST",
+            "/token",
+            data={"username": "admin", "password": "password"}
+        )
+        if response.status_code == 200:
+            payload = response.json()
+            self.token = payload["access_token"]
+            expires_in = payload.get("expires_in", settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+            self._token_expires_at = time.time() + expires_in
+        else:
+            raise HTTPException(status_code=401, detail="Failed to authenticate with MCP server")
+    
+    async def _auth_headers(self) -> Dict[str, str]:
+        if not self._token_is_fresh():
+            async with self._refresh_lock:
+                if not self._token_is_fresh():
+                    await self.login()
+        return {"Authorization": f"Bearer {self.token}"}
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Authenticated MCP request; a 401 drops the cached token and retries once"""
+        headers = await self._auth_headers()
+        response = await self._send(method, url, headers=headers, **kwargs)
+        if response.status_code == 401:
+            if headers["Authorization"] == f"Bearer {self.token}":
+                self.token = None
+            headers = await self._auth_headers()
+            response = await self._send(method, url, headers=headers, **kwargs)
+        return response
     
     async def analyze_cultural_context(self, text: str) -> Dict[str, Any]:
-        if not self.token:
-            await self.login()
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/cultural/analyze",
-                json={"text": text},
-                headers={"Authorization": f"Bearer {self.token}"}
-            )
-            if response.status_code == 200:
-                return response.json()
-            else:
+        future = asyncio.get_running_loop().create_future()
+        self._analyze_queue.append((text, future))
+        if self._analyze_flusher is None or self._analyze_flusher.done():
+            self._analyze_flusher = asyncio.create_task(self._flush_analyze_queue())
+        return await future
+    
+    async def _flush_analyze_queue(self):
+        while self._analyze_queue:
+            await asyncio.sleep(MCP_BATCH_WINDOW)
+            while self._analyze_queue:
+                batch = self._analyze_queue[:MCP_MAX_BATCH]
+                del self._analyze_queue[:MCP_MAX_BATCH]
+                task = asyncio.create_task(self._analyze_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _analyze_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        error: BaseException = HTTPException(status_code=500, detail="Failed to analyze cultural context")
+        try:
+            results = await self._fetch_analysis_batch([text for text, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            error = e
+            if len(batch) > 1:
+                # One bad text fails the whole batch request; retry item by item so only its caller fails
+                await asyncio.gather(*(self._analyze_into(text, future) for text, future in batch))
+        finally:
+            # Whatever happened above, no caller is left waiting forever
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+    
+    async def _fetch_analysis_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        response = await self._request("POST", "/api/v1/cultural/analyze_batch", json={"texts": texts})
+        if response.status_code != 200:
+            raise HTTPException(status_code=500, detail="Failed to analyze cultural context")
+        results = response.json()
+        if not isinstance(results, list) or len(results) != len(texts):
+            raise HTTPException(status_code=500, detail="Malformed cultural analysis batch response")
+        return results
+    
+    async def _analyze_into(self, text: str, future: asyncio.Future):
+        try:
+            response = await self._request("POST", "/api/v1/cultural/analyze", json={"text": text})
+            if response.status_code != 200:
                 raise HTTPException(status_code=500, detail="Failed to analyze cultural context")
+            result = response.json()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
     
     async def adjust_cultural_context(self, text: str) -> str:
-        if not self.token:
-            await self.login()
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/v1/cultural/adjust",
-                json={"text": text},
-                headers={"Authorization": f"Bearer {self.token}"}
-            )
-            if response.status_code == 200:
-                return response.json()["adjusted_text"]
-            else:
-                raise HTTPException(status_code=500, detail="Failed to adjust cultural context")
+        response = await self._request("POST", "/api/v1/cultural/adjust", json={"text": text})
+        if response.status_code == 200:
+            return response.json()["adjusted_text"]
+        else:
+            raise HTTPException(status_code=500, detail="Failed to adjust cultural context")
+    
+    async def aclose(self):
+        await self._client.aclose()
 
 # Initialize MCP client
 mcp_client = ThaiCulturalMCPClient()
 
+@router.on_event("shutdown")
+async def close_mcp_client():
+    await mcp_client.aclose()
+
+@router.on_event("startup")
+async def start_broadcast_relay():
+    if settings.REDIS_URL:
+        await manager.start_pubsub(settings.REDIS_URL)
+
+@router.on_event("shutdown")
+async def stop_broadcast_relay():
+    await manager.stop_pubsub()
+
 # REST Endpoints
 @router.post("/message", response_model=ChatResponse)
 async def chat_message(
@@ -173,7 +497,7 @@ async def chat_message(
     background_tasks: BackgroundTasks
 ):
     """Process a chat message with cultural context"""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     try:
         # Get AI client
@@ -183,7 +507,7 @@ async def chat_message(
         response = await process_message_with_cultural_context(message, client)
         
         # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         # Log usage in background
         background_tasks.add_task(
@@ -208,9 +532,16 @@ async def chat_message(
             status_code=500,
             detail=f"Error processing message: {str(e)}"
         )
-    finally:
-        if 'client' in locals():
-            await client.close()
+
+@router.post("/message/stream")
+async def chat_message_stream(message: ChatMessage):
+    """Stream a chat response as plain text while the model generates it"""
+    client = get_ai_client(message.model)
+    cultural_context = message.context.model_dump() if message.context else None
+    return StreamingResponse(
+        client.stream_response(message.text, cultural_context),
+        media_type="text/plain; charset=utf-8"
+    )
 
 async def log_chat_usage(message: ChatMessage, response: Dict[str, Any], processing_time: float):
     """Log chat usage statistics"""
@@ -223,20 +554,47 @@ async def log_chat_usage(message: ChatMessage, response: Dict[str, Any], process
     except Exception as e:
         logger.error(f"Error logging chat usage: {str(e)}")
 
+async def stream_chat_reply(client_id: str,
+                            message: ChatMessage,
+                            client: Union[OpenAIClient, ClaudeClient]):
+    """Forward the model's output to one WebSocket client chunk by chunk"""
+    cultural_context = await _apply_cultural_context(message)
+    chunks: List[str] = []
+    async for chunk in client.stream_response(message.text, cultural_context):
+        chunks.append(chunk)
+        await manager.send_message(
+            client_id,
+            WebSocketMessage(type="message", content={"delta": chunk})
+        )
+    await manager.send_message(
+        client_id,
+        WebSocketMessage(
+            type="message",
+            content={"text": "".join(chunks), "model": client.model, "done": True}
+        )
+    )
+
 # WebSocket Endpoints
 @router.websocket("/ws/{client_id}")
-async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    """WebSocket endpoint for real-time chat"""
-    await manager.connect(websocket, client_id)
+async def websocket_endpoint(websocket: WebSocket,
+                             client_id: str,
+                             room: Optional[str] = None,
+                             stream: bool = False):
+    """WebSocket endpoint for real-time chat.
+
+    With `?stream=true` the reply is sent as `{"delta": ...}` messages while the
+    model generates it, followed by one `{"text": ..., "model": ..., "done": true}`.
+    """
+    await manager.connect(websocket, client_id, room)
     
     try:
         while True:
             # Receive message
             data = await websocket.receive_text()
-            message_data = json.loads(data)
+            message_data = _loads(data)
             
             # Create chat message
-            chat_message = ChatMessage(**message_data)
+            chat_message = ChatMessage.model_validate(message_data)
             
             # Send typing indicator
             await manager.send_message(
@@ -251,6 +609,10 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                 # Get AI client
                 client = get_ai_client(chat_message.model)
                 
+                if stream:
+                    await stream_chat_reply(client_id, chat_message, client)
+                    continue
+                
                 # Process message and generate response
                 response = await process_message_with_cultural_context(chat_message, client)
                 
@@ -277,9 +639,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                         content={"error": str(e)}
                     )
                 )
-            finally:
-                if 'client' in locals():
-                    await client.close()
                 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
@@ -307,12 +666,17 @@ async def chat(
     current_user: TokenData = Depends(get_current_user)
 ):
     """Chat endpoint with cultural intelligence"""
+    key = _cache_key(message.model, _normalize_text(message.text))
+    cached = _chat_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        # Analyze cultural context
-        cultural_analysis = await mcp_client.analyze_cultural_context(message.text)
-        
-        # Adjust response based on cultural context
-        adjusted_response = await mcp_client.adjust_cultural_context(message.text)
+        # Analyze cultural context and adjust the response; the two MCP calls are independent
+        cultural_analysis, adjusted_response = await asyncio.gather(
+            mcp_client.analyze_cultural_context(message.text),
+            mcp_client.adjust_cultural_context(message.text)
+        )
         
         # Create cultural context
         cultural_context = CulturalContext(
@@ -323,7 +687,7 @@ async def chat(
             cultural_patterns=cultural_analysis["cultural_patterns"]
         )
         
-        return ChatResponse(
+        response = ChatResponse(
             text=adjusted_response,
             model=message.model,
             usage={"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
@@ -331,6 +695,8 @@ async def chat(
             cultural_context=cultural_context,
             suggestions=cultural_analysis["suggestions"]
         )
+        _chat_cache.set(key, response)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -339,33 +705,19 @@ async def get_prompts(
     current_user: TokenData = Depends(get_current_user)
 ):
     """Get available cultural prompts"""
-    if not mcp_client.token:
-        await mcp_client.login()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{mcp_client.base_url}/api/v1/cultural/prompts",
-            headers={"Authorization": f"Bearer {mcp_client.token}"}
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=500, detail="Failed to get cultural prompts")
+    response = await mcp_client._request("GET", "/api/v1/cultural/prompts")
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise HTTPException(status_code=500, detail="Failed to get cultural prompts")
 
 @router.get("/cultural/resources")
 async def get_resources(
     current_user: TokenData = Depends(get_current_user)
 ):
     """Get available cultural resources"""
-    if not mcp_client.token:
-        await mcp_client.login()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{mcp_client.base_url}/api/v1/cultural/resources",
-            headers={"Authorization": f"Bearer {mcp_client.token}"}
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=500, detail="Failed to get cultural resources") 
\ No newline at end of file
+    response = await mcp_client._request("GET", "/api/v1/cultural/resources")
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise HTTPException(status_code=500, detail="Failed to get cultural resources") 
\ No newline at end of file
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_serializer, validator
 from typing import Dict, Any, List, Optional, Union
 import logging
+import asyncio
+import time
 from datetime import datetime
 from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
@@ -75,10 +77,14 @@ class CulturalAnalysisResponse(BaseModel):
     cultural_patterns: List[CulturalPattern]
     adaptations: List[CulturalAdaptation]
     processing_time: float
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: float = Field(default_factory=time.time)  # Epoch seconds; ISO 8601 when serialized
+
+    @field_serializer("timestamp")
+    def serialize_timestamp(self, timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).isoformat()
 
 # Helper Functions
-def analyze_politeness(text: str, language: str) -> PolitenessAnalysis:
+async def analyze_politeness(text: str, language: str) -> PolitenessAnalysis:
     """Analyze politeness level and patterns"""
     # This would be implemented using the ThaiCulturalEngine
     # For now, returning mock data
@@ -93,7 +99,7 @@ def analyze_politeness(text: str, language: str) -> PolitenessAnalysis:
         }
     )
 
-def analyze_formality(text: str, language: str) -> FormalityAnalysis:
+async def analyze_formality(text: str, language: str) -> FormalityAnalysis:
     """Analyze formality level and patterns"""
     # This would be implemented using the ThaiCulturalEngine
     # For now, returning mock data
@@ -109,7 +115,7 @@ def analyze_formality(text: str, language: str) -> FormalityAnalysis:
         }
     )
 
-def detect_cultural_patterns(text: str, language: str) -> List[CulturalPattern]:
+async def detect_cultural_patterns(text: str, language: str) -> List[CulturalPattern]:
     """Detect cultural patterns in text"""
     # This would be implemented using the ThaiCulturalEngine
     # For now, returning mock data
@@ -128,7 +134,7 @@ def detect_cultural_patterns(text: str, language: str) -> List[CulturalPattern]:
         )
     ]
 
-def suggest_adaptations(
+async def suggest_adaptations(
     text: str,
     language: str,
     context_type: str
@@ -149,33 +155,26 @@ def suggest_adaptations(
 @router.post("/analyze", response_model=CulturalAnalysisResponse)
 async def analyze_cultural_context(request: CulturalAnalysisRequest):
     """Analyze cultural context of text"""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     try:
         # Process with cultural engine
-        processed = await cultural_engine.process_message({
+        processed = await cultural_engine.process({
             "text": request.text,
             "context_type": request.context_type
         })
         
-        # Analyze politeness
-        politeness = analyze_politeness(processed["adjusted_text"], request.language)
-        
-        # Analyze formality
-        formality = analyze_formality(processed["adjusted_text"], request.language)
-        
-        # Detect cultural patterns
-        patterns = detect_cultural_patterns(processed["adjusted_text"], request.language)
-        
-        # Suggest adaptations
-        adaptations = suggest_adaptations(
-            processed["adjusted_text"],
-            request.language,
-            request.context_type
+        # Run the four independent analyses concurrently
+        adjusted_text = processed["adjusted_text"]
+        politeness, formality, patterns, adaptations = await asyncio.gather(
+            analyze_politeness(adjusted_text, request.language),
+            analyze_formality(adjusted_text, request.language),
+            detect_cultural_patterns(adjusted_text, request.language),
+            suggest_adaptations(adjusted_text, request.language, request.context_type)
         )
         
         # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         return CulturalAnalysisResponse(
             text=request.text,
@@ -2,6 +2,6 @@
 Configuration module for ZynxAGI
 """
 
-from .settings import settings
+from .settings import settings, get_settings
 
-__all__ = ["settings"]
+__all__ = ["settings", "get_settings"]
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import FrozenSet, Optional
+from functools import lru_cache
 
 class Settings(BaseSettings):
     # Application Settings
@@ -11,10 +12,23 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     GOOGLE_API_KEY: Optional[str] = None
+
+    # AI client connection pools
+    OPENAI_MAX_CONNECTIONS: int = 2000
+    ANTHROPIC_MAX_CONNECTIONS: int = 2000
+    PREWARM: bool = True  # Open the pooled connection when a shared client is first created
+
+    # Client-side request rate limits (requests per minute, per API key)
+    OPENAI_RPM: int = 500
+    ANTHROPIC_RPM: int = 50
     
     # Basic Settings
     SECRET_KEY: str = "zynx-agi-secret-key-development"  # This should be overridden in production
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    SESSION_TTL_SECONDS: int = 3600  # Idle sessions are evicted after this long
+    
+    # Shared state across workers (sessions, WebSocket broadcasts); unset keeps both in-process
+    REDIS_URL: Optional[str] = None
     
     # Cultural Intelligence
     CULTURAL_INTELLIGENCE_MODEL: str = "deeja-v1"
@@ -23,19 +37,24 @@ class Settings(BaseSettings):
     FORMAL_CONTEXT_WEIGHT: float = 0.8
     INFORMAL_CONTEXT_WEIGHT: float = 0.6
     
-    # CORS
-    ALLOWED_ORIGINS: List[str] = [
+    # CORS (a set: the middleware checks the request origin against it on every request)
+    ALLOWED_ORIGINS: FrozenSet[str] = frozenset({
         "http://localhost:3000",
         "http://localhost:5173",
         "http://localhost:8080",
         "https://zynxdata.com",
         "https://www.zynxdata.com"
-    ]
+    })
     
     class Config:
         env_file = ".env"
         case_sensitive = True
         extra = "ignore"  # Ignore extra fields instead of forbidding
 
+@lru_cache
+def get_settings() -> Settings:
+    """The process-wide Settings instance; usable as a FastAPI dependency"""
+    return Settings()
+
 # Create settings instance
-settings = Settings() 
\ No newline at end of file
+settings = get_settings() 
\ No newline at end of file
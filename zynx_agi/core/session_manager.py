@@ -1,24 +1,37 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import json
+import logging
+import time
 from uuid import uuid4
+from ..config.settings import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Optional; only RedisSessionManager needs it
+    aioredis = None
+
+logger = logging.getLogger(__name__)
 
 class Session:
     """Represents a user session."""
     def __init__(self, session_id: str):
         self.session_id: str = session_id
-        self.created_at: float = time.time() # type: ignore
-        self.last_accessed: float = time.time() # type: ignore
+        self.created_at: float = time.time()
+        self.last_accessed: float = time.time()
         self.data: Dict[str, Any] = {}
 
     def get(self, key: str) -> Optional[Any]:
-        self.last_accessed = time.time() # type: ignore
+        self.last_accessed = time.time()
         return self.data.get(key)
 
     def set(self, key: str, value: Any) -> None:
-        self.last_accessed = time.time() # type: ignore
+        self.last_accessed = time.time()
         self.data[key] = value
 
     def update_data(self, data: Dict[str, Any]) -> None:
-        self.last_accessed = time.time() # type: ignore
+        self.last_accessed = time.time()
         self.data.update(data)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -30,20 +43,36 @@ class Session:
         }
 
 class SessionManager:
-    """Manages user sessions (in-memory for now)."""
-    def __init__(self):
+    """Manages user sessions (in-memory for now).
+
+    Sessions idle for longer than `ttl` seconds are evicted. A min-heap of
+    (last_accessed, session_id) keeps eviction O(log N) per session; entries are
+    only pushed on creation and re-pushed when a popped entry turns out to be stale.
+    """
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl: float = settings.SESSION_TTL_SECONDS if ttl is None else ttl
         self._sessions: Dict[str, Session] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._reaper: Optional[asyncio.Task] = None
+
+    def _is_expired(self, session: Session, now: float) -> bool:
+        return session.last_accessed + self.ttl < now
 
     def create_session(self) -> Session:
         session_id = str(uuid4())
         session = Session(session_id)
         self._sessions[session_id] = session
+        heapq.heappush(self._heap, (session.last_accessed, session_id))
         return session
 
     def get_session(self, session_id: str) -> Optional[Session]:
         session = self._sessions.get(session_id)
         if session:
-            session.last_accessed = time.time() # type: ignore
+            now = time.time()
+            if self._is_expired(session, now):
+                del self._sessions[session_id]
+                return None
+            session.last_accessed = now
         return session
 
     def delete_session(self, session_id: str) -> bool:
@@ -52,8 +81,96 @@ class SessionManager:
             return True
         return False
 
-    def get_all_sessions(self) -> list[Session]:
-        return list(self._sessions.values())
+    def get_all_sessions(self) -> Iterator[Session]:
+        yield from self._sessions.values()
 
-# Placeholder for time import, will be added if not present by other logic
-import time
+    def expire_sessions(self) -> int:
+        """Evict sessions idle for longer than the TTL; returns how many were removed"""
+        now = time.time()
+        deadline = now - self.ttl
+        removed = 0
+        heap = self._heap
+        while heap and heap[0][0] < deadline:
+            _, session_id = heapq.heappop(heap)
+            session = self._sessions.get(session_id)
+            if session is None:
+                continue  # Deleted explicitly or already evicted
+            if self._is_expired(session, now):
+                del self._sessions[session_id]
+                removed += 1
+            else:
+                # Touched since this entry was pushed; reschedule at its current access time
+                heapq.heappush(heap, (session.last_accessed, session_id))
+        return removed
+
+    def start_reaper(self, interval: float = 60.0) -> None:
+        """Evict expired sessions every `interval` seconds on the running event loop"""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap(interval))
+
+    async def stop_reaper(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+
+    async def _reap(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.expire_sessions()
+            if removed:
+                logger.info(f"Expired {removed} idle sessions")
+
+class RedisSessionManager:
+    """Session store shared by every worker, kept in Redis hashes `session:<id>`.
+
+    Idle expiry is delegated to Redis: each write or read refreshes the key's TTL.
+    """
+    def __init__(self, redis_url: Optional[str] = None, ttl: Optional[float] = None):
+        if aioredis is None:
+            raise RuntimeError("redis is required for RedisSessionManager")
+        self.ttl: int = int(settings.SESSION_TTL_SECONDS if ttl is None else ttl)
+        self._redis = aioredis.from_url(redis_url or settings.REDIS_URL, decode_responses=True)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    async def _save(self, session: Session) -> None:
+        key = self._key(session.session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "created_at": session.created_at,
+                "last_accessed": session.last_accessed,
+                "data": json.dumps(session.data, ensure_ascii=False),
+            })
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def create_session(self) -> Session:
+        session = Session(str(uuid4()))
+        await self._save(session)
+        return session
+
+    async def get_session(self, session_id: str) -> Optional[Session]:
+        fields = await self._redis.hgetall(self._key(session_id))
+        if not fields:
+            return None
+        session = Session(session_id)
+        session.created_at = float(fields["created_at"])
+        session.data = json.loads(fields["data"])
+        await self._save(session)  # Records the access and refreshes the TTL
+        return session
+
+    async def save_session(self, session: Session) -> None:
+        """Persist changes made through Session.set/update_data"""
+        await self._save(session)
+
+    async def delete_session(self, session_id: str) -> bool:
+        return bool(await self._redis.delete(self._key(session_id)))
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
@@ -1,11 +1,23 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable
 from ..config import settings # Import the settings instance directly
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine # Import the engine
 
+ProcessFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+def _missing_process(handler: Any) -> ProcessFunc:
+    """Defer the missing-`process` AttributeError to dispatch time, as before."""
+    async def process(message: Dict[str, Any]) -> Any:
+        return await handler.process(message)
+    return process
+
 class UniversalDispatcher:
+    __slots__ = ("settings", "_handlers", "_dispatch", "thai_engine")
+
     def __init__(self):
         self.settings = settings # Use the imported settings instance
         self._handlers: Dict[str, Any] = {}
+        # Bound `process` methods snapshotted at registration; dispatch is one dict get + call
+        self._dispatch: Dict[str, ProcessFunc] = {}
 
         # Instantiate and register ThaiCulturalEngine
         self.thai_engine = ThaiCulturalEngine()
@@ -14,20 +26,21 @@ class UniversalDispatcher:
     def register_handler(self, handler_type: str, handler: Any) -> None:
         """Register a new handler for a specific type of message."""
         self._handlers[handler_type] = handler
+        self._dispatch[handler_type] = getattr(handler, "process", None) or _missing_process(handler)
 
     async def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Dispatch a message to the appropriate handler."""
         handler_type = message.get("type", "default")
-        handler = self._handlers.get(handler_type)
-        
-        if not handler:
+        process = self._dispatch.get(handler_type)
+
+        if process is None:
             return {
                 "status": "error",
                 "message": f"No handler found for type: {handler_type}"
             }
-        
+
         try:
-            result = await handler.process(message)
+            result = await process(message)
             return {
                 "status": "success",
                 "data": result
@@ -36,4 +49,4 @@ class UniversalDispatcher:
             return {
                 "status": "error",
                 "message": str(e)
-            } 
\ No newline at end of file
+            }
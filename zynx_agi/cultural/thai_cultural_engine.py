@@ -1,9 +1,376 @@
 from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import functools
 import re
 from dataclasses import dataclass
+from types import MappingProxyType
 from ..config.settings import settings
 
-@dataclass
+try:
+    import ahocorasick
+except ImportError:  # Optional; the scans fall back to one substring check per term
+    ahocorasick = None
+
+# Formality score deltas per formal_patterns category, in analyze_formality's order
+_FORMALITY_DELTAS = (
+    ("pronouns", "formal", 0.3),
+    ("verbs", "formal", 0.2),
+    ("greetings", "formal", 0.2),
+    ("pronouns", "informal", -0.3),
+    ("verbs", "informal", -0.2),
+    ("greetings", "informal", -0.2),
+)
+
+# Particles _make_less_polite strips from a text
+_POLITE_ENDINGS = ("ค่ะ", "ครับ", "นะคะ", "นะครับ")
+
+def _substitution(pairs) -> Tuple["re.Pattern[str]", Dict[str, str]]:
+    """One longest-first alternation over the source words and the source -> target map.
+
+    The first pair for a repeated source word wins, as it did with sequential replaces.
+    """
+    mapping: Dict[str, str] = {}
+    for source, target in pairs:
+        mapping.setdefault(source, target)
+    pattern = re.compile("|".join(map(re.escape, sorted(mapping, key=len, reverse=True))))
+    return pattern, mapping
+
+# Static language tables, shared read-only by every engine
+
+# Polite particles and their formality levels
+_POLITE_PARTICLES = MappingProxyType({
+    # Most formal particles
+    "ครับ": 1.0,
+    "ค่ะ": 1.0,
+    "ค่ะ/ครับ": 1.0,
+    "ครับ/ค่ะ": 1.0,
+    "ขอประทาน": 1.0,
+    "กราบเรียน": 1.0,
+    "กราบทูล": 1.0,
+    
+    # Semi-formal particles
+    "นะคะ": 0.8,
+    "นะครับ": 0.8,
+    "ค่ะนะ": 0.8,
+    "ครับนะ": 0.8,
+    "ขอโทษค่ะ": 0.8,
+    "ขอโทษครับ": 0.8,
+    
+    # Casual polite particles
+    "จ้ะ": 0.6,
+    "จ้า": 0.6,
+    "นะ": 0.5,
+    "จ๋า": 0.4,
+    "สิ": 0.3,
+    "เหรอ": 0.3,
+    "หรอ": 0.3,
+    
+    # Question particles
+    "หรือคะ": 0.8,
+    "หรือครับ": 0.8,
+    "หรือเปล่าคะ": 0.8,
+    "หรือเปล่าครับ": 0.8,
+    "ไหมคะ": 0.8,
+    "ไหมครับ": 0.8,
+})
+
+# Thai cultural patterns and their characteristics
+_CULTURAL_PATTERNS = MappingProxyType({
+    "kreng_jai": {
+        "patterns": (
+            r"ไม่เป็นไร",
+            r"ไม่ต้องกังวล",
+            r"ไม่เป็นไรมาก",
+            r"ไม่ต้องลำบาก",
+            r"ไม่ต้องห่วง",
+            r"ไม่ต้องเกรงใจ",
+            r"ไม่ต้องอาย",
+            r"ไม่ต้องเกรงใจกัน",
+            r"ไม่ต้องเกรงใจเลย",
+            r"ไม่ต้องกังวลใจ",
+            r"ไม่ต้องเป็นห่วง",
+            r"ไม่ต้องเกรงใจกันเลย",
+            r"ไม่ต้องเกรงใจกันมาก"
+        ),
+        "weight": 0.8
+    },
+    "sanuk": {
+        "patterns": (
+            r"สนุก",
+            r"เฮฮา",
+            r"รื่นเริง",
+            r"เบิกบาน",
+            r"สดใส",
+            r"มีความสุข",
+            r"เพลิดเพลิน",
+            r"บันเทิง",
+            r"ครึกครื้น",
+            r"ครื้นเครง",
+            r"สนุกสนาน",
+            r"เบิกบานใจ",
+            r"สดชื่น",
+            r"สดใสใจ"
+        ),
+        "weight": 0.7
+    },
+    "mai_pen_rai": {
+        "patterns": (
+            r"ไม่เป็นไร",
+            r"ไม่เป็นไรมาก",
+            r"ไม่ต้องกังวล",
+            r"ปล่อยไป",
+            r"ช่างมัน",
+            r"ไม่เป็นอะไร",
+            r"ไม่เป็นไรมากมาย",
+            r"ไม่ต้องห่วง",
+            r"ไม่ต้องกังวลใจ",
+            r"ไม่ต้องเป็นห่วง",
+            r"ไม่เป็นไรหรอก",
+            r"ไม่เป็นไรเลย",
+            r"ไม่เป็นไรจริงๆ",
+            r"ไม่เป็นไรหรอกค่ะ"
+        ),
+        "weight": 0.6
+    },
+    "greng_jai": {
+        "patterns": (
+            r"เกรงใจ",
+            r"เกรงใจคุณ",
+            r"เกรงใจท่าน",
+            r"เกรงใจพี่",
+            r"เกรงใจน้อง",
+            r"เกรงใจกัน",
+            r"เกรงใจมาก",
+            r"เกรงใจจริงๆ",
+            r"เกรงใจเหลือเกิน",
+            r"เกรงใจมากมาย",
+            r"เกรงใจกันมาก",
+            r"เกรงใจกันจริงๆ",
+            r"เกรงใจกันเหลือเกิน",
+            r"เกรงใจกันมากมาย"
+        ),
+        "weight": 0.9
+    },
+    "jai_yen": {
+        "patterns": (
+            r"ใจเย็น",
+            r"ใจเย็นๆ",
+            r"ใจเย็นไว้",
+            r"ใจเย็นก่อน",
+            r"ใจเย็นสักนิด",
+            r"ใจเย็นหน่อย",
+            r"ใจเย็นๆ นะ",
+            r"ใจเย็นไว้ก่อน",
+            r"ใจเย็นสักครู่นะ",
+            r"ใจเย็นๆ ไว้ก่อน",
+            r"ใจเย็นไว้ก่อนนะ",
+            r"ใจเย็นสักครู่นะคะ",
+            r"ใจเย็นๆ ไว้ก่อนนะ",
+            r"ใจเย็นไว้ก่อนนะคะ"
+        ),
+        "weight": 0.7
+    },
+    "nam_jai": {
+        "patterns": (
+            r"น้ำใจ",
+            r"น้ำใจดี",
+            r"มีน้ำใจ",
+            r"น้ำใจงาม",
+            r"น้ำใจดีมาก",
+            r"น้ำใจงามมาก",
+            r"น้ำใจดีจริงๆ",
+            r"น้ำใจงามจริงๆ",
+            r"น้ำใจดีเหลือเกิน",
+            r"น้ำใจงามเหลือเกิน",
+            r"น้ำใจดีมากมาย",
+            r"น้ำใจงามมากมาย",
+            r"น้ำใจดีจริงๆ ค่ะ",
+            r"น้ำใจงามจริงๆ ค่ะ"
+        ),
+        "weight": 0.8
+    },
+    "kreng_klua": {
+        "patterns": (
+            r"เกรงกลัว",
+            r"เกรงกลัวคุณ",
+            r"เกรงกลัวท่าน",
+            r"เกรงกลัวพี่",
+            r"เกรงกลัวน้อง",
+            r"เกรงกลัวกัน",
+            r"เกรงกลัวมาก",
+            r"เกรงกลัวจริงๆ",
+            r"เกรงกลัวเหลือเกิน",
+            r"เกรงกลัวมากมาย",
+            r"เกรงกลัวกันมาก",
+            r"เกรงกลัวกันจริงๆ",
+            r"เกรงกลัวกันเหลือเกิน",
+            r"เกรงกลัวกันมากมาย"
+        ),
+        "weight": 0.7
+    }
+})
+
+# Formal language patterns
+_FORMAL_PATTERNS = MappingProxyType({
+    "pronouns": {
+        "formal": (
+            "ดิฉัน", "กระผม", "ผม", "หนู",
+            "ข้าพเจ้า", "กระหม่อม", "หม่อมฉัน",
+            "ข้าพระพุทธเจ้า", "ใต้เท้า"
+        ),
+        "informal": (
+            "กู", "มึง", "เรา", "ชั้น",
+            "ข้า", "ข้าน้อย", "ข้าพระพุทธเจ้า",
+            "ข้าพระพุทธเจ้า", "ข้าพระพุทธเจ้า"
+        )
+    },
+    "verbs": {
+        "formal": (
+            "ขออนุญาต", "กราบเรียน", "กราบทูล", "ขอประทาน",
+            "ขออภัย", "ขออ้าง", "ขอแจ้ง", "ขอรายงาน",
+            "ขอเสนอ", "ขอแนะนำ"
+        ),
+        "informal": (
+            "บอก", "พูด", "บอกให้", "บอกว่า",
+            "บอกเลย", "บอกไป", "บอกมา", "บอกก่อน",
+            "บอกที", "บอกหน่อย"
+        )
+    },
+    "greetings": {
+        "formal": (
+            "สวัสดีครับ", "สวัสดีค่ะ",
+            "กราบสวัสดีครับ", "กราบสวัสดีค่ะ",
+            "กราบเรียนสวัสดีครับ", "กราบเรียนสวัสดีค่ะ"
+        ),
+        "informal": (
+            "สวัสดี", "หวัดดี", "หวัดดีจ้า",
+            "หวัดดีจ๋า", "หวัดดีนะ", "หวัดดีค่ะ"
+        )
+    }
+})
+
+def _is_literal(pattern: str) -> bool:
+    """True when pattern has no regex syntax and IGNORECASE cannot change what it matches"""
+    return re.escape(pattern).replace("\\ ", " ") == pattern and pattern.lower() == pattern.upper()
+
+def _build_lexicon() -> Tuple[Any, bool]:
+    """Compile the particle, formality and cultural pattern tables into one automaton.
+
+    Each term maps to (term, particle entry or None, formality deltas, pattern categories).
+    Returns (automaton or None without pyahocorasick, whether the cultural patterns are in it).
+    """
+    if ahocorasick is None:
+        return None, False
+    lexicon: Dict[str, Tuple[Any, List[Tuple[int, float]], List[str]]] = {}
+
+    def entry(term: str):
+        return lexicon.setdefault(term, (None, [], []))
+
+    for order, (particle, formality) in enumerate(_POLITE_PARTICLES.items()):
+        lexicon[particle] = ((order, particle, formality), [], [])
+
+    # A term listed more than once (or in both registers) keeps every (position, delta)
+    # so the score sums exactly as the per-list loops did
+    order = 0
+    for category, register, delta in _FORMALITY_DELTAS:
+        for term in _FORMAL_PATTERNS[category][register]:
+            entry(term)[1].append((order, delta))
+            order += 1
+
+    # The cultural patterns are plain literals, so they join the automaton;
+    # they stay on regex if an entry ever needs real regex syntax
+    patterns = [(name, pattern) for name, data in _CULTURAL_PATTERNS.items() for pattern in data["patterns"]]
+    culture_literal = all(_is_literal(pattern) for _, pattern in patterns)
+    if culture_literal:
+        for name, pattern in patterns:
+            entry(pattern)[2].append(name)
+
+    lexicon_ac = ahocorasick.Automaton()
+    for term, (particle, deltas, names) in lexicon.items():
+        lexicon_ac.add_word(term, (term, particle, tuple(deltas), tuple(names)))
+    lexicon_ac.make_automaton()
+    return lexicon_ac, culture_literal
+
+# Suggestion texts, by the score condition that triggers them
+_SUGG_LOW_FORMALITY = (
+    "ควรใช้ภาษาที่เป็นทางการมากขึ้น",
+    "เพิ่มคำสรรพนามที่เป็นทางการ (ดิฉัน, กระผม)",
+    "ใช้คำกริยาที่เป็นทางการ (กราบเรียน, ขออนุญาต)",
+)
+_SUGG_HIGH_FORMALITY = (
+    "ควรใช้ภาษาที่เป็นกันเองมากขึ้น",
+    "ลดการใช้คำสรรพนามที่เป็นทางการ",
+    "ใช้คำกริยาที่เป็นกันเองมากขึ้น",
+)
+_SUGG_LOW_POLITENESS = (
+    "ควรเพิ่มความสุภาพในการสื่อสาร",
+    "เพิ่มคำลงท้ายที่สุภาพ (ค่ะ, ครับ)",
+    "ใช้คำขอโทษและขอบคุณให้มากขึ้น",
+)
+_SUGG_HIGH_POLITENESS = (
+    "อาจจะสุภาพมากเกินไปในบางสถานการณ์",
+    "ลองปรับระดับความสุภาพให้เหมาะสมกับบริบท",
+)
+# Per cultural pattern scoring above 0.7, in the order they are suggested
+_SUGG_PATTERNS = (
+    ("kreng_jai", ("แสดงความเกรงใจในระดับที่เหมาะสม", "ใช้คำพูดที่แสดงความเกรงใจอย่างสุภาพ")),
+    ("sanuk", ("สร้างบรรยากาศที่เป็นมิตรและสนุกสนาน", "ใช้คำพูดที่สร้างความสุขและความบันเทิง")),
+    ("jai_yen", ("แสดงความใจเย็นและความเข้าใจ", "ใช้คำพูดที่ให้กำลังใจและปลอบใจ")),
+    ("nam_jai", ("แสดงน้ำใจและความเอื้อเฟื้อ", "ใช้คำพูดที่แสดงความมีน้ำใจและความช่วยเหลือ")),
+)
+
+# Particles from most to least formal (ties keep table order); the first one present sets the score
+_PARTICLES_BY_FORMALITY = tuple(sorted(_POLITE_PARTICLES.items(), key=lambda kv: -kv[1]))
+
+# Per category: (weight, one fused alternation, a matcher per pattern). The fused
+# scan rules a category out in one pass; only categories that hit score per pattern.
+# Literal patterns match with str.__contains__, skipping the regex engine
+_COMPILED_PATTERNS = MappingProxyType({
+    name: (
+        data["weight"],
+        re.compile("|".join(f"(?:{pattern})" for pattern in data["patterns"]), re.IGNORECASE),
+        tuple(
+            (lambda text, literal=pattern: literal in text) if _is_literal(pattern)
+            else re.compile(pattern, re.IGNORECASE).search
+            for pattern in data["patterns"]
+        )
+    )
+    for name, data in _CULTURAL_PATTERNS.items()
+})
+
+# Word substitutions for formal <-> casual rewrites, each applied in one regex pass
+_FORMALIZE = _substitution(
+    list(zip(_FORMAL_PATTERNS["pronouns"]["informal"], _FORMAL_PATTERNS["pronouns"]["formal"]))
+    + list(zip(_FORMAL_PATTERNS["verbs"]["informal"], _FORMAL_PATTERNS["verbs"]["formal"]))
+)
+_CASUALIZE = _substitution(
+    list(zip(_FORMAL_PATTERNS["pronouns"]["formal"], _FORMAL_PATTERNS["pronouns"]["informal"]))
+    + list(zip(_FORMAL_PATTERNS["verbs"]["formal"], _FORMAL_PATTERNS["verbs"]["informal"]))
+)
+_POLITE_ENDINGS_RE = re.compile("|".join(map(re.escape, sorted(_POLITE_ENDINGS, key=len, reverse=True))))
+
+# Every table term contains Thai script, so text without any cannot match one
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+_THAI_ONLY_TERMS = all(
+    _THAI_RE.search(term)
+    for term in (
+        *_POLITE_PARTICLES,
+        *(term for registers in _FORMAL_PATTERNS.values() for terms in registers.values() for term in terms),
+        *(pattern for data in _CULTURAL_PATTERNS.values() for pattern in data["patterns"]),
+    )
+)
+
+def _may_match(text: str) -> bool:
+    """False when text cannot contain any table term (e.g. plain English)"""
+    return not _THAI_ONLY_TERMS or _THAI_RE.search(text) is not None
+
+# One Aho-Corasick automaton over every term in the tables above;
+# a single walk of the text feeds all three analyses. Scans stay on str:
+# CPython stores Thai as 2 bytes per code point, UTF-8 needs 3, so
+# encoding first would add a pass and enlarge the buffer being scanned
+_LEXICON = _build_lexicon()
+
+@dataclass(slots=True, frozen=True)
 class ThaiCulturalContext:
     """Thai cultural context analysis result"""
     formality_level: float  # 0.0 to 1.0
@@ -13,6 +380,17 @@ class ThaiCulturalContext:
     detected_particles: List[str]  # Detected polite particles
     cultural_patterns: List[str]  # Detected cultural patterns
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the fields (no deep copy, unlike dataclasses.asdict)"""
+        return {
+            "formality_level": self.formality_level,
+            "politeness_level": self.politeness_level,
+            "cultural_elements": self.cultural_elements,
+            "suggestions": self.suggestions,
+            "detected_particles": self.detected_particles,
+            "cultural_patterns": self.cultural_patterns
+        }
+
 class ThaiCulturalEngine:
     """Thai cultural intelligence engine"""
     
@@ -23,233 +401,77 @@ class ThaiCulturalEngine:
         self.cultural_weight = settings.THAI_CULTURAL_WEIGHT
         self.cultural_threshold = settings.DEFAULT_CULTURAL_THRESHOLD
         
-        # Polite particles and their formality levels
-        self.polite_particles = {
-            # Most formal particles
-            "ครับ": 1.0,
-            "ค่ะ": 1.0,
-            "ค่ะ/ครับ": 1.0,
-            "ครับ/ค่ะ": 1.0,
-            "ขอประทาน": 1.0,
-            "กราบเรียน": 1.0,
-            "กราบทูล": 1.0,
-            
-            # Semi-formal particles
-            "นะคะ": 0.8,
-            "นะครับ": 0.8,
-            "ค่ะนะ": 0.8,
-            "ครับนะ": 0.8,
-            "ขอโทษค่ะ": 0.8,
-            "ขอโทษครับ": 0.8,
-            
-            # Casual polite particles
-            "จ้ะ": 0.6,
-            "จ้า": 0.6,
-            "นะ": 0.5,
-            "จ๋า": 0.4,
-            "สิ": 0.3,
-            "เหรอ": 0.3,
-            "หรอ": 0.3,
-            
-            # Question particles
-            "หรือคะ": 0.8,
-            "หรือครับ": 0.8,
-            "หรือเปล่าคะ": 0.8,
-            "หรือเปล่าครับ": 0.8,
-            "ไหมคะ": 0.8,
-            "ไหมครับ": 0.8,
-        }
-        
-        # Thai cultural patterns and their characteristics
-        self.cultural_patterns = {
-            "kreng_jai": {
-                "patterns": [
-                    r"ไม่เป็นไร",
-                    r"ไม่ต้องกังวล",
-                    r"ไม่เป็นไรมาก",
-                    r"ไม่ต้องลำบาก",
-                    r"ไม่ต้องห่วง",
-                    r"ไม่ต้องเกรงใจ",
-                    r"ไม่ต้องอาย",
-                    r"ไม่ต้องเกรงใจ",
-                    r"ไม่ต้องเกรงใจกัน",
-                    r"ไม่ต้องเกรงใจเลย",
-                    r"ไม่ต้องกังวลใจ",
-                    r"ไม่ต้องเป็นห่วง",
-                    r"ไม่ต้องเกรงใจกันเลย",
-                    r"ไม่ต้องเกรงใจกันมาก"
-                ],
-                "weight": 0.8
-            },
-            "sanuk": {
-                "patterns": [
-                    r"สนุก",
-                    r"เฮฮา",
-                    r"รื่นเริง",
-                    r"เบิกบาน",
-                    r"สดใส",
-                    r"มีความสุข",
-                    r"เพลิดเพลิน",
-                    r"บันเทิง",
-                    r"ครึกครื้น",
-                    r"ครื้นเครง",
-                    r"สนุกสนาน",
-                    r"เบิกบานใจ",
-                    r"สดชื่น",
-                    r"สดใสใจ"
-                ],
-                "weight": 0.7
-            },
-            "mai_pen_rai": {
-                "patterns": [
-                    r"ไม่เป็นไร",
-                    r"ไม่เป็นไรมาก",
-                    r"ไม่ต้องกังวล",
-                    r"ปล่อยไป",
-                    r"ช่างมัน",
-                    r"ไม่เป็นอะไร",
-                    r"ไม่เป็นไรมากมาย",
-                    r"ไม่ต้องห่วง",
-                    r"ไม่ต้องกังวลใจ",
-                    r"ไม่ต้องเป็นห่วง",
-                    r"ไม่เป็นไรหรอก",
-                    r"ไม่เป็นไรเลย",
-                    r"ไม่เป็นไรจริงๆ",
-                    r"ไม่เป็นไรหรอกค่ะ"
-                ],
-                "weight": 0.6
-            },
-            "greng_jai": {
-                "patterns": [
-                    r"เกรงใจ",
-                    r"เกรงใจคุณ",
-                    r"เกรงใจท่าน",
-                    r"เกรงใจพี่",
-                    r"เกรงใจน้อง",
-                    r"เกรงใจกัน",
-                    r"เกรงใจมาก",
-                    r"เกรงใจจริงๆ",
-                    r"เกรงใจเหลือเกิน",
-                    r"เกรงใจมากมาย",
-                    r"เกรงใจกันมาก",
-                    r"เกรงใจกันจริงๆ",
-                    r"เกรงใจกันเหลือเกิน",
-                    r"เกรงใจกันมากมาย"
-                ],
-                "weight": 0.9
-            },
-            "jai_yen": {
-                "patterns": [
-                    r"ใจเย็น",
-                    r"ใจเย็นๆ",
-                    r"ใจเย็นไว้",
-                    r"ใจเย็นก่อน",
-                    r"ใจเย็นสักนิด",
-                    r"ใจเย็นหน่อย",
-                    r"ใจเย็นๆ นะ",
-                    r"ใจเย็นไว้ก่อน",
-                    r"ใจเย็นสักครู่นะ",
-                    r"ใจเย็นๆ ไว้ก่อน",
-                    r"ใจเย็นไว้ก่อนนะ",
-                    r"ใจเย็นสักครู่นะคะ",
-                    r"ใจเย็นๆ ไว้ก่อนนะ",
-                    r"ใจเย็นไว้ก่อนนะคะ"
-                ],
-                "weight": 0.7
-            },
-            "nam_jai": {
-                "patterns": [
-                    r"น้ำใจ",
-                    r"น้ำใจดี",
-                    r"มีน้ำใจ",
-                    r"น้ำใจงาม",
-                    r"น้ำใจดีมาก",
-                    r"น้ำใจงามมาก",
-                    r"น้ำใจดีจริงๆ",
-                    r"น้ำใจงามจริงๆ",
-                    r"น้ำใจดีเหลือเกิน",
-                    r"น้ำใจงามเหลือเกิน",
-                    r"น้ำใจดีมากมาย",
-                    r"น้ำใจงามมากมาย",
-                    r"น้ำใจดีจริงๆ ค่ะ",
-                    r"น้ำใจงามจริงๆ ค่ะ"
-                ],
-                "weight": 0.8
-            },
-            "kreng_klua": {
-                "patterns": [
-                    r"เกรงกลัว",
-                    r"เกรงกลัวคุณ",
-                    r"เกรงกลัวท่าน",
-                    r"เกรงกลัวพี่",
-                    r"เกรงกลัวน้อง",
-                    r"เกรงกลัวกัน",
-                    r"เกรงกลัวมาก",
-                    r"เกรงกลัวจริงๆ",
-                    r"เกรงกลัวเหลือเกิน",
-                    r"เกรงกลัวมากมาย",
-                    r"เกรงกลัวกันมาก",
-                    r"เกรงกลัวกันจริงๆ",
-                    r"เกรงกลัวกันเหลือเกิน",
-                    r"เกรงกลัวกันมากมาย"
-                ],
-                "weight": 0.7
-            }
-        }
-        
-        # Formal language patterns
-        self.formal_patterns = {
-            "pronouns": {
-                "formal": [
-                    "ดิฉัน", "กระผม", "ผม", "หนู",
-                    "ข้าพเจ้า", "กระหม่อม", "หม่อมฉัน",
-                    "ข้าพระพุทธเจ้า", "ใต้เท้า"
-                ],
-                "informal": [
-                    "กู", "มึง", "เรา", "ชั้น",
-                    "ข้า", "ข้าน้อย", "ข้าพระพุทธเจ้า",
-                    "ข้าพระพุทธเจ้า", "ข้าพระพุทธเจ้า"
-                ]
-            },
-            "verbs": {
-                "formal": [
-                    "ขออนุญาต", "กราบเรียน", "กราบทูล", "ขอประทาน",
-                    "ขออภัย", "ขออ้าง", "ขอแจ้ง", "ขอรายงาน",
-                    "ขอเสนอ", "ขอแนะนำ"
-                ],
-                "informal": [
-                    "บอก", "พูด", "บอกให้", "บอกว่า",
-                    "บอกเลย", "บอกไป", "บอกมา", "บอกก่อน",
-                    "บอกที", "บอกหน่อย"
-                ]
-            },
-            "greetings": {
-                "formal": [
-                    "สวัสดีครับ", "สวัสดีค่ะ",
-                    "กราบสวัสดีครับ", "กราบสวัสดีค่ะ",
-                    "กราบเรียนสวัสดีครับ", "กราบเรียนสวัสดีค่ะ"
-                ],
-                "informal": [
-                    "สวัสดี", "หวัดดี", "หวัดดีจ้า",
-                    "หวัดดีจ๋า", "หวัดดีนะ", "หวัดดีค่ะ"
-                ]
-            }
-        }
+        # Read-only views of the module tables; every engine shares them and their matchers
+        self.polite_particles = _POLITE_PARTICLES
+        self._particles_sorted = _PARTICLES_BY_FORMALITY
+        self.cultural_patterns = _CULTURAL_PATTERNS
+        self.formal_patterns = _FORMAL_PATTERNS
+        self._compiled_patterns = _COMPILED_PATTERNS
+        self._formalize_re, self._informal_to_formal = _FORMALIZE
+        self._casualize_re, self._formal_to_informal = _CASUALIZE
+        self._polite_endings_re = _POLITE_ENDINGS_RE
+        self._lexicon_ac, self._culture_literal = _LEXICON
+        
+        # Analysis depends only on the text; repeated messages (greetings especially) hit this
+        self._analyze = functools.lru_cache(maxsize=4096)(self._analyze_text)
+        # Suggestions are a pure function of the scores; text with no cultural content
+        # (most non-Thai traffic) always gets this same list
+        self._no_content_suggestions = tuple(self.generate_cultural_suggestions(0.0, 0.0, {}))
+
+    def _scan(self, text: str) -> Dict[str, Tuple[str, Any, Tuple[Tuple[int, float], ...], Tuple[str, ...]]]:
+        """Every known term present in text, from one automaton walk"""
+        return {hit[0]: hit for _, hit in self._lexicon_ac.iter(text)}
+
+    @staticmethod
+    def _particles_from(hits) -> Tuple[List[str], float]:
+        matched = {particle[0]: particle for _, particle, _, _ in hits.values() if particle}
+        # Report particles in table order, as the per-particle scan did
+        detected = [matched[order][1] for order in sorted(matched)]
+        return detected, max((formality for _, _, formality in matched.values()), default=0.0)
+
+    @staticmethod
+    def _formality_from(hits) -> float:
+        formality_score = sum(delta for _, delta in sorted(d for _, _, deltas, _ in hits.values() for d in deltas))
+        return max(0.0, min(1.0, formality_score))
+
+    def _patterns_from(self, hits) -> Dict[str, float]:
+        # Each listed pattern present in the text adds its category's weight once
+        counts: Dict[str, int] = {}
+        for _, _, _, names in hits.values():
+            for name in names:
+                counts[name] = counts.get(name, 0) + 1
+        pattern_scores = {}
+        for pattern_name, (weight, _, _) in self._compiled_patterns.items():
+            count = counts.get(pattern_name)
+            if count:
+                pattern_scores[pattern_name] = min(1.0, count * weight)
+        return pattern_scores
 
     def analyze_polite_particles(self, text: str) -> Tuple[List[str], float]:
         """Analyze polite particles in text"""
-        detected_particles = []
-        politeness_score = 0.0
+        if not _may_match(text):
+            return [], 0.0
+        if self._lexicon_ac is not None:
+            return self._particles_from(self._scan(text))
         
-        for particle, formality in self.polite_particles.items():
+        politeness_score = 0.0
+        for particle, formality in self._particles_sorted:
             if particle in text:
-                detected_particles.append(particle)
-                politeness_score = max(politeness_score, formality)
+                politeness_score = formality
+                break
+        if not politeness_score:
+            return [], 0.0
         
+        detected_particles = [particle for particle in self.polite_particles if particle in text]
         return detected_particles, politeness_score
 
     def analyze_formality(self, text: str) -> float:
         """Analyze formality level of text"""
+        if not _may_match(text):
+            return 0.0
+        if self._lexicon_ac is not None:
+            return self._formality_from(self._scan(text))
+        
         formality_score = 0.0
         
         # Check for formal pronouns
@@ -284,18 +506,40 @@ class ThaiCulturalEngine:
 
     def detect_cultural_patterns(self, text: str) -> Dict[str, float]:
         """Detect Thai cultural patterns in text"""
+        if not _may_match(text):
+            return {}
+        if self._lexicon_ac is not None and self._culture_literal:
+            return self._patterns_from(self._scan(text))
+        
         pattern_scores = {}
         
-        for pattern_name, pattern_data in self.cultural_patterns.items():
+        for pattern_name, (weight, any_pattern, patterns) in self._compiled_patterns.items():
+            if not any_pattern.search(text):
+                continue
             score = 0.0
-            for regex in pattern_data["patterns"]:
-                if re.search(regex, text, re.IGNORECASE):
-                    score += pattern_data["weight"]
+            for matches in patterns:
+                if matches(text):
+                    score += weight
             if score > 0:
                 pattern_scores[pattern_name] = min(1.0, score)
         
         return pattern_scores
 
+    def _analyze_text(self, text: str) -> Tuple[Tuple[str, ...], float, float, Tuple[Tuple[str, float], ...]]:
+        """(particles, politeness, formality, pattern score items); immutable so it can be cached"""
+        if not _may_match(text):
+            return (), 0.0, 0.0, ()
+        if self._lexicon_ac is not None and self._culture_literal:
+            hits = self._scan(text)
+            particles, politeness = self._particles_from(hits)
+            formality = self._formality_from(hits)
+            cultural_patterns = self._patterns_from(hits)
+        else:
+            particles, politeness = self.analyze_polite_particles(text)
+            formality = self.analyze_formality(text)
+            cultural_patterns = self.detect_cultural_patterns(text)
+        return tuple(particles), politeness, formality, tuple(cultural_patterns.items())
+
     def generate_cultural_suggestions(self, 
                                    formality: float, 
                                    politeness: float,
@@ -305,39 +549,21 @@ class ThaiCulturalEngine:
         
         # Formality suggestions
         if formality < 0.3:
-            suggestions.append("ควรใช้ภาษาที่เป็นทางการมากขึ้น")
-            suggestions.append("เพิ่มคำสรรพนามที่เป็นทางการ (ดิฉัน, กระผม)")
-            suggestions.append("ใช้คำกริยาที่เป็นทางการ (กราบเรียน, ขออนุญาต)")
+            suggestions.extend(_SUGG_LOW_FORMALITY)
         elif formality > 0.8:
-            suggestions.append("ควรใช้ภาษาที่เป็นกันเองมากขึ้น")
-            suggestions.append("ลดการใช้คำสรรพนามที่เป็นทางการ")
-            suggestions.append("ใช้คำกริยาที่เป็นกันเองมากขึ้น")
+            suggestions.extend(_SUGG_HIGH_FORMALITY)
         
         # Politeness suggestions
         if politeness < 0.3:
-            suggestions.append("ควรเพิ่มความสุภาพในการสื่อสาร")
-            suggestions.append("เพิ่มคำลงท้ายที่สุภาพ (ค่ะ, ครับ)")
-            suggestions.append("ใช้คำขอโทษและขอบคุณให้มากขึ้น")
+            suggestions.extend(_SUGG_LOW_POLITENESS)
         elif politeness > 0.8:
-            suggestions.append("อาจจะสุภาพมากเกินไปในบางสถานการณ์")
-            suggestions.append("ลองปรับระดับความสุภาพให้เหมาะสมกับบริบท")
+            suggestions.extend(_SUGG_HIGH_POLITENESS)
         
         # Cultural pattern suggestions
-        if "kreng_jai" in cultural_patterns and cultural_patterns["kreng_jai"] > 0.7:
-            suggestions.append("แสดงความเกรงใจในระดับที่เหมาะสม")
-            suggestions.append("ใช้คำพูดที่แสดงความเกรงใจอย่างสุภาพ")
-        
-        if "sanuk" in cultural_patterns and cultural_patterns["sanuk"] > 0.7:
-            suggestions.append("สร้างบรรยากาศที่เป็นมิตรและสนุกสนาน")
-            suggestions.append("ใช้คำพูดที่สร้างความสุขและความบันเทิง")
-        
-        if "jai_yen" in cultural_patterns and cultural_patterns["jai_yen"] > 0.7:
-            suggestions.append("แสดงความใจเย็นและความเข้าใจ")
-            suggestions.append("ใช้คำพูดที่ให้กำลังใจและปลอบใจ")
-        
-        if "nam_jai" in cultural_patterns and cultural_patterns["nam_jai"] > 0.7:
-            suggestions.append("แสดงน้ำใจและความเอื้อเฟื้อ")
-            suggestions.append("ใช้คำพูดที่แสดงความมีน้ำใจและความช่วยเหลือ")
+        if cultural_patterns:
+            for pattern_name, pattern_suggestions in _SUGG_PATTERNS:
+                if cultural_patterns.get(pattern_name, 0.0) > 0.7:
+                    suggestions.extend(pattern_suggestions)
         
         return suggestions
 
@@ -346,8 +572,7 @@ class ThaiCulturalEngine:
                        target_formality: float = 0.7,
                        target_politeness: float = 0.8) -> str:
         """Adjust response based on cultural context"""
-        current_formality = self.analyze_formality(text)
-        current_politeness = self.analyze_polite_particles(text)[1]
+        _, current_politeness, current_formality, _ = self._analyze(text)
         
         # Adjust formality
         if current_formality < target_formality:
@@ -367,41 +592,34 @@ class ThaiCulturalEngine:
         
         return text
 
+    def adjustment_targets(self, context_type: str) -> Tuple[float, float]:
+        """(target_formality, target_politeness) that process() adjusts towards"""
+        if context_type == "formal":
+            return self.settings.FORMAL_CONTEXT_WEIGHT, self.settings.THAI_CULTURAL_WEIGHT
+        return self.settings.INFORMAL_CONTEXT_WEIGHT, self.settings.THAI_CULTURAL_WEIGHT
+
+    def fast_estimate(self, text: str) -> Tuple[float, float]:
+        """Cheap (formality, politeness) estimate: only the two scans adjust_response relies on"""
+        return self.analyze_formality(text), self.analyze_polite_particles(text)[1]
+
+    def is_near_target(self, text: str, context_type: str, tolerance: float = 0.05) -> bool:
+        """True when text is already within `tolerance` of the targets, so adjusting can be skipped"""
+        formality, politeness = self.fast_estimate(text)
+        target_formality, target_politeness = self.adjustment_targets(context_type)
+        return (abs(formality - target_formality) < tolerance
+                and abs(politeness - target_politeness) < tolerance)
+
     def _make_more_formal(self, text: str) -> str:
         """Make text more formal"""
-        # Replace informal pronouns with formal ones
-        for informal, formal in zip(
-            self.formal_patterns["pronouns"]["informal"],
-            self.formal_patterns["pronouns"]["formal"]
-        ):
-            text = text.replace(informal, formal)
-        
-        # Replace informal verbs with formal ones
-        for informal, formal in zip(
-            self.formal_patterns["verbs"]["informal"],
-            self.formal_patterns["verbs"]["formal"]
-        ):
-            text = text.replace(informal, formal)
-        
-        return text
+        # Replace informal pronouns and verbs with formal ones
+        mapping = self._informal_to_formal
+        return self._formalize_re.sub(lambda match: mapping[match.group(0)], text)
 
     def _make_more_casual(self, text: str) -> str:
         """Make text more casual"""
-        # Replace formal pronouns with informal ones
-        for formal, informal in zip(
-            self.formal_patterns["pronouns"]["formal"],
-            self.formal_patterns["pronouns"]["informal"]
-        ):
-            text = text.replace(formal, informal)
-        
-        # Replace formal verbs with informal ones
-        for formal, informal in zip(
-            self.formal_patterns["verbs"]["formal"],
-            self.formal_patterns["verbs"]["informal"]
-        ):
-            text = text.replace(formal, informal)
-        
-        return text
+        # Replace formal pronouns and verbs with informal ones
+        mapping = self._formal_to_informal
+        return self._casualize_re.sub(lambda match: mapping[match.group(0)], text)
 
     def _make_more_polite(self, text: str) -> str:
         """Make text more polite"""
@@ -414,25 +632,30 @@ class ThaiCulturalEngine:
     def _make_less_polite(self, text: str) -> str:
         """Make text less polite"""
         # Remove polite particles
-        for particle in ["ค่ะ", "ครับ", "นะคะ", "นะครับ"]:
-            text = text.replace(particle, "")
-        
-        return text
+        return self._polite_endings_re.sub("", text)
 
     async def process(self, message: Dict[str, Any]) -> Dict[str, Any]: # Renamed from process_message
-        """Process a message with Thai cultural context"""
+        """Process a message with Thai cultural context, in a worker thread"""
+        # The scans below are pure-Python and CPU-bound; keep them off the event loop
+        return await asyncio.to_thread(self.process_sync, message)
+
+    def process_sync(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous body of process()"""
         text = message.get("text", "")
         context_type = message.get("context_type", "formal")
         
         # Analyze text
-        particles, politeness = self.analyze_polite_particles(text)
-        formality = self.analyze_formality(text)
-        cultural_patterns = self.detect_cultural_patterns(text)
+        particle_tuple, politeness, formality, pattern_items = self._analyze(text)
+        particles = list(particle_tuple)
+        cultural_patterns = dict(pattern_items)
         
         # Generate suggestions
-        suggestions = self.generate_cultural_suggestions(
-            formality, politeness, cultural_patterns
-        )
+        if not particles and not cultural_patterns and formality == 0.0:
+            suggestions = list(self._no_content_suggestions)
+        else:
+            suggestions = self.generate_cultural_suggestions(
+                formality, politeness, cultural_patterns
+            )
         
         # Create cultural context
         cultural_context = ThaiCulturalContext(
@@ -441,16 +664,16 @@ class ThaiCulturalEngine:
             cultural_elements=cultural_patterns,
             suggestions=suggestions,
             detected_particles=particles,
-            cultural_patterns=list(cultural_patterns.keys())
+            cultural_patterns=list(cultural_patterns)
         )
         
         # Adjust response if needed
         if message.get("adjust_response", True):
+            target_formality, target_politeness = self.adjustment_targets(context_type)
             adjusted_text = self.adjust_response(
                 text,
-                target_formality=self.settings.FORMAL_CONTEXT_WEIGHT if context_type == "formal" 
-                               else self.settings.INFORMAL_CONTEXT_WEIGHT,
-                target_politeness=self.settings.THAI_CULTURAL_WEIGHT
+                target_formality=target_formality,
+                target_politeness=target_politeness
             )
         else:
             adjusted_text = text
@@ -458,12 +681,5 @@ class ThaiCulturalEngine:
         return {
             "original_text": text,
             "adjusted_text": adjusted_text,
-            "cultural_context": {
-                "formality_level": formality,
-                "politeness_level": politeness,
-                "cultural_elements": cultural_patterns,
-                "suggestions": suggestions,
-                "detected_particles": particles,
-                "cultural_patterns": list(cultural_patterns.keys())
-            }
+            "cultural_context": cultural_context.to_dict()
         } 
\ No newline at end of file
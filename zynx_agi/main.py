@@ -3,12 +3,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import logging
+import copy
+import re
+from functools import lru_cache
 from .config.settings import settings
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Thai script block, and the particles that mark a message as polite
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+_POLITE_RE = re.compile("|".join(map(re.escape, ["ครับ", "ค่ะ", "นะ", "จ้ะ"])))
+
 # Create FastAPI app
 app = FastAPI(
     title="ZynxAGI",
@@ -67,6 +74,61 @@ async def health_check():
         logger.error(f"Error in health check: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Canned chat_message responses keyed by (is_greeting, is_thai); "message" is a
+# template filled with the user's text
+def _chat_response(message: str, cultural_context: dict) -> dict:
+    return {
+        "message": message,
+        "aiPlatform": "deeja",
+        "culturalContext": cultural_context,
+        "culturalAccuracyScore": 0.95,
+        "emotionalIntelligenceScore": 0.88,
+        "processingTime": 0.5
+    }
+
+_CHAT_RESPONSES = {
+    (True, True): _chat_response(
+        "สวัสดีค่ะ! ยินดีต้อนรับสู่ ZynxAGI 🌟 ฉันคือ Deeja น้องดีจ้าที่จะช่วยคุณเชื่อมต่อกับ AI ที่เหมาะสมที่สุดพร้อมความเข้าใจทางวัฒนธรรม! ระบบกำลังพัฒนาอยู่แต่พร้อมช่วยเหลือคุณแล้วค่ะ ✨",
+        {
+            "primaryCulture": "thai",
+            "formalityLevel": "casual",
+            "politenessLevel": 0.9,
+            "culturalMarkers": ["ค่ะ", "kreng_jai"],
+            "communicationStyle": "warm_thai"
+        }
+    ),
+    (True, False): _chat_response(
+        "Hello! Welcome to ZynxAGI 🌟 I'm Deeja, your cultural-intelligent AI assistant who will help you connect with the most suitable AI while understanding cultural nuances! The system is under development but ready to help you! ✨",
+        {
+            "primaryCulture": "international",
+            "formalityLevel": "friendly",
+            "politenessLevel": 0.7,
+            "culturalMarkers": [],
+            "communicationStyle": "warm_international"
+        }
+    ),
+    (False, True): _chat_response(
+        "ขอบคุณสำหรับข้อความ: '{message}' ค่ะ 🙏 ZynxAGI กำลังพัฒนาระบบความฉลาดทางวัฒนธรรมเพื่อเข้าใจการสื่อสารแบบไทยและสากลค่ะ ฉันพร้อมช่วยเหลือคุณ! 🤖💫",
+        {
+            "primaryCulture": "thai",
+            "formalityLevel": "casual",
+            "politenessLevel": 0.8,
+            "culturalMarkers": ["ค่ะ"],
+            "communicationStyle": "helpful_thai"
+        }
+    ),
+    (False, False): _chat_response(
+        "Thank you for your message: '{message}' 🙏 ZynxAGI is developing cultural intelligence to understand both Thai and international communication styles. I'm here to help! 🤖💫",
+        {
+            "primaryCulture": "international",
+            "formalityLevel": "casual",
+            "politenessLevel": 0.7,
+            "culturalMarkers": [],
+            "communicationStyle": "helpful_international"
+        }
+    ),
+}
+
 # Chat endpoint for testing
 @app.post("/api/v1/chat/message")
 async def chat_message(request: dict):
@@ -75,53 +137,29 @@ async def chat_message(request: dict):
         message = request.get("message", "")
         
         # Detect Thai or English
-        is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message)
-        
-        if "สวัสดี" in message or "hello" in message.lower() or "hi" in message.lower():
-            if is_thai:
-                response_text = "สวัสดีค่ะ! ยินดีต้อนรับสู่ ZynxAGI 🌟 ฉันคือ Deeja น้องดีจ้าที่จะช่วยคุณเชื่อมต่อกับ AI ที่เหมาะสมที่สุดพร้อมความเข้าใจทางวัฒนธรรม! ระบบกำลังพัฒนาอยู่แต่พร้อมช่วยเหลือคุณแล้วค่ะ ✨"
-                cultural_context = {
-                    "primaryCulture": "thai",
-                    "formalityLevel": "casual",
-                    "politenessLevel": 0.9,
-                    "culturalMarkers": ["ค่ะ", "kreng_jai"],
-                    "communicationStyle": "warm_thai"
-                }
-            else:
-                response_text = "Hello! Welcome to ZynxAGI 🌟 I'm Deeja, your cultural-intelligent AI assistant who will help you connect with the most suitable AI while understanding cultural nuances! The system is under development but ready to help you! ✨"
-                cultural_context = {
-                    "primaryCulture": "international",
-                    "formalityLevel": "friendly",
-                    "politenessLevel": 0.7,
-                    "culturalMarkers": [],
-                    "communicationStyle": "warm_international"
-                }
-        else:
-            if is_thai:
-                response_text = f"ขอบคุณสำหรับข้อความ: '{message}' ค่ะ 🙏 ZynxAGI กำลังพัฒนาระบบความฉลาดทางวัฒนธรรมเพื่อเข้าใจการสื่อสารแบบไทยและสากลค่ะ ฉันพร้อมช่วยเหลือคุณ! 🤖💫"
-            else:
-                response_text = f"Thank you for your message: '{message}' 🙏 ZynxAGI is developing cultural intelligence to understand both Thai and international communication styles. I'm here to help! 🤖💫"
-            
-            cultural_context = {
-                "primaryCulture": "thai" if is_thai else "international",
-                "formalityLevel": "casual",
-                "politenessLevel": 0.8 if is_thai else 0.7,
-                "culturalMarkers": ["ค่ะ"] if is_thai else [],
-                "communicationStyle": "helpful_thai" if is_thai else "helpful_international"
-            }
+        is_thai = not message.isascii() and _THAI_RE.search(message) is not None
+        lowered = message.lower()
+        is_greeting = "สวัสดี" in message or "hello" in lowered or "hi" in lowered
         
-        return {
-            "message": response_text,
-            "aiPlatform": "deeja",
-            "culturalContext": cultural_context,
-            "culturalAccuracyScore": 0.95,
-            "emotionalIntelligenceScore": 0.88,
-            "processingTime": 0.5
-        }
+        # Deep copy so no caller can mutate the shared nested culturalContext
+        response = copy.deepcopy(_CHAT_RESPONSES[(is_greeting, is_thai)])
+        if not is_greeting:
+            response["message"] = response["message"].format(message=message)
+        return response
     except Exception as e:
         logger.error(f"Error in chat message: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@lru_cache(maxsize=4096)
+def _detect_culture(text: str) -> tuple:
+    """(is_thai, has_politeness) for a text; identical payloads skip the scans"""
+    # Every marker is Thai script, so ASCII text (English traffic) needs no scan at all
+    if text.isascii():
+        return False, False
+    is_thai = _THAI_RE.search(text) is not None
+    has_politeness = _POLITE_RE.search(text) is not None
+    return is_thai, has_politeness
+
 @app.post("/api/v1/cultural/analyze")
 async def cultural_analyze(request: dict):
     """Cultural analysis endpoint"""
@@ -129,8 +167,7 @@ async def cultural_analyze(request: dict):
         text = request.get("text", "")
         
         # Simple but effective cultural analysis
-        is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in text)
-        has_politeness = any(particle in text for particle in ["ครับ", "ค่ะ", "นะ", "จ้ะ"])
+        is_thai, has_politeness = _detect_culture(text)
         
         return {
             "primaryCulture": "thai" if is_thai else "international",
@@ -3,7 +3,7 @@
 API endpoints for Zynx AGI monitoring dashboard
 """
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Response
 from typing import Dict, Any, Optional
 import json
 from .zynx_monitor import zynx_monitor
@@ -16,42 +16,9 @@ def create_monitoring_router() -> APIRouter:
     @router.get("/metrics/current")
     async def get_current_zynx_metrics():
         """Get current Zynx AGI metrics"""
-        if zynx_monitor.metrics_buffer:
-            latest = zynx_monitor.metrics_buffer[-1]
-            data = {
-                "timestamp": latest.timestamp.isoformat(),
-                "performance": {
-                    "inference_time_ms": latest.inference_time_ms,
-                    "tokens_per_second": latest.tokens_per_second,
-                    "concurrent_requests": latest.concurrent_requests,
-                    "queue_depth": latest.queue_depth
-                },
-                "cultural_intelligence": {
-                    "cultural_accuracy": latest.cultural_accuracy_score,
-                    "emotional_intelligence": latest.emotional_intelligence_score,
-                    "thai_proficiency": latest.thai_language_proficiency,
-                    "formality_detection": latest.formality_detection_accuracy,
-                    "avg_politeness": latest.politeness_level_avg
-                },
-                "ai_platforms": {
-                    "openai_requests": latest.openai_requests,
-                    "claude_requests": latest.claude_requests,
-                    "errors": latest.ai_platform_errors
-                },
-                "system": {
-                    "cpu_percent": latest.cpu_percent,
-                    "memory_percent": latest.memory_percent,
-                    "active_websockets": latest.active_websockets,
-                    "success_rate": latest.success_rate,
-                    "uptime_seconds": latest.uptime_seconds
-                },
-                "language_usage": {
-                    "thai_ratio": latest.thai_messages_ratio,
-                    "english_ratio": latest.english_messages_ratio,
-                    "cultural_switches": latest.cultural_context_switches
-                }
-            }
-            return data
+        blob = zynx_monitor.latest_metrics_json
+        if blob is not None:
+            return Response(content=blob, media_type="application/json")
         return {"error": "No metrics available"}
     
     @router.get("/summary")
@@ -78,7 +45,7 @@ def create_monitoring_router() -> APIRouter:
     async def websocket_metrics_endpoint(websocket: WebSocket):
         """WebSocket endpoint for real-time Zynx metrics"""
         await websocket.accept()
-        zynx_monitor.websocket_clients.add(websocket)
+        zynx_monitor.add_websocket_client(websocket)
         
         try:
             while True:
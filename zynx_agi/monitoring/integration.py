@@ -4,6 +4,7 @@ Easy integration functions for existing Zynx AGI codebase
 """
 
 import time
+from contextlib import contextmanager
 from fastapi import FastAPI, WebSocket
 from .middleware import ZynxMonitoringMiddleware
 from .zynx_monitor import zynx_monitor
@@ -38,46 +39,31 @@ def setup_zynx_monitoring(app: FastAPI) -> None:
     return zynx_monitor
 
 # Context managers and decorators for manual tracking
-class track_chat_inference:
+@contextmanager
+def track_chat_inference(message: str, cultural_context: dict, ai_platform: str):
     """
     Context manager for tracking chat inference in existing code
     
     Usage:
         # In your existing chat.py
-        with track_chat_inference(message, cultural_context, "openai") as tracker:
+        with track_chat_inference(message, cultural_context, "openai"):
             response = await process_message_with_cultural_context(message, client)
-            tracker.set_success(True)
     """
-    
-    def __init__(self, message: str, cultural_context: dict, ai_platform: str):
-        self.message = message
-        self.cultural_context = cultural_context
-        self.ai_platform = ai_platform
-        self.start_time = None
-        self.success = False
-        
-    def __enter__(self):
-        self.start_time = time.time()
-        return self
-        
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
-            processing_time = (time.time() - self.start_time) * 1000
-            
-            if exc_type is not None:
-                # Error occurred
-                zynx_monitor.track_ai_platform_error(self.ai_platform, str(exc_val))
-            else:
-                # Success
-                zynx_monitor.track_chat_request(
-                    message=self.message,
-                    cultural_context=self.cultural_context,
-                    processing_time=processing_time,
-                    ai_platform=self.ai_platform
-                )
-                
-    def set_success(self, success: bool):
-        self.success = success
+    start_time = time.perf_counter_ns()
+    try:
+        yield
+    except Exception as e:
+        # Error occurred
+        zynx_monitor.track_ai_platform_error(ai_platform, str(e))
+        raise
+    else:
+        # Success
+        zynx_monitor.track_chat_request(
+            message=message,
+            cultural_context=cultural_context,
+            processing_time=(time.perf_counter_ns() - start_time) / 1_000_000,
+            ai_platform=ai_platform
+        )
 
 def track_websocket_connection(websocket: WebSocket, connected: bool):
     """Helper function to track WebSocket connections"""
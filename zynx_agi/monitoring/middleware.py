@@ -4,90 +4,121 @@ Zynx AGI Monitoring Middleware
 Seamlessly integrates with existing FastAPI app
 """
 
+import re
 import time
-import json
-from fastapi import FastAPI, Request, Response, WebSocket
-from fastapi.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from typing import List
 import logging
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 from .zynx_monitor import zynx_monitor
 
 logger = logging.getLogger(__name__)
 
-class ZynxMonitoringMiddleware(BaseHTTPMiddleware):
-    """Middleware to automatically track Zynx AGI requests"""
+# Any character in the Thai Unicode block
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+
+# Mock cultural contexts (you can enhance this); shared by every request, so never mutated.
+# Plain dicts rather than MappingProxyType because the monitor json.dumps them
+_CTX_THAI = {"primaryCulture": "thai", "formalityLevel": 0.7, "politenessLevel": 0.8}
+_CTX_INTL = {"primaryCulture": "international", "formalityLevel": 0.7, "politenessLevel": 0.8}
+
+class ZynxMonitoringMiddleware:
+    """Middleware to automatically track Zynx AGI requests
+
+    Plain ASGI, so each request costs one extra coroutine frame rather than the
+    task pair and Request/Response wrapping of BaseHTTPMiddleware.
+    """
     
-    def __init__(self, app: FastAPI):
-        super().__init__(app)
+    # Path fragments matched anywhere in the path, case-insensitively, in one regex pass
+    # ('/api/v1/chat' is covered by '/chat'); prefixes alone would miss /api/v1/cultural/...
+    _CHAT_PATHS = re.compile("|".join(map(re.escape, ['/chat', '/api/v1/chat', '/message'])), re.IGNORECASE)
+    _CULTURAL_PATHS = re.compile("|".join(map(re.escape, ['/cultural', '/analyze'])), re.IGNORECASE)
+    
+    def __init__(self, app):
+        self.app = app
         self.monitor = zynx_monitor
         
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        path = scope["path"]
+        is_chat = self._is_chat_endpoint(path)
+        is_cultural = not is_chat and self._is_cultural_endpoint(path)
+        if not (is_chat or is_cultural):
+            # Nothing is recorded for other routes, so they skip timing and the counters
+            return await self.app(scope, receive, send)
+        
         # Start timing
-        start_time = time.time()
-        request_id = id(request)
+        start_time = time.perf_counter_ns()
+        
+        # Chat bodies are teed as the app reads them; the app still receives every chunk
+        body_chunks: List[bytes] = []
+        
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                body_chunks.append(message.get("body", b""))
+            return message
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Calculate metrics
+                processing_time = (time.perf_counter_ns() - start_time) / 1_000_000  # ms
+                
+                # Track specific endpoints
+                if is_chat:
+                    await self._track_chat_request(b"".join(body_chunks), processing_time)
+                elif is_cultural:
+                    await self._track_cultural_request(processing_time)
+            await send(message)
         
         # Track active request
-        self.monitor.websocket_connections += 1
+        self.monitor.inc_active()
         
         try:
             # Process request
-            response = await call_next(request)
-            
-            # Calculate metrics
-            processing_time = (time.time() - start_time) * 1000  # ms
-            
-            # Track specific endpoints
-            if self._is_chat_endpoint(request.url.path):
-                await self._track_chat_request(request, response, processing_time)
-            elif self._is_cultural_endpoint(request.url.path):
-                await self._track_cultural_request(request, response, processing_time)
-                
-            return response
-            
+            await self.app(scope, receive_wrapper if is_chat else receive, send_wrapper)
         except Exception as e:
             # Track errors
             self.monitor.track_ai_platform_error("system", str(e))
             raise
         finally:
             # Remove from active requests
-            self.monitor.websocket_connections = max(0, self.monitor.websocket_connections - 1)
+            self.monitor.dec_active()
             
     def _is_chat_endpoint(self, path: str) -> bool:
         """Check if endpoint is chat-related"""
-        chat_paths = ['/chat', '/api/v1/chat', '/message']
-        return any(chat_path in path.lower() for chat_path in chat_paths)
+        return self._CHAT_PATHS.search(path) is not None
         
     def _is_cultural_endpoint(self, path: str) -> bool:
         """Check if endpoint is cultural analysis related"""
-        cultural_paths = ['/cultural', '/analyze']
-        return any(cultural_path in path.lower() for cultural_path in cultural_paths)
+        return self._CULTURAL_PATHS.search(path) is not None
         
-    async def _track_chat_request(self, request: Request, response: Response, processing_time: float):
+    async def _track_chat_request(self, body: bytes, processing_time: float):
         """Track chat-specific metrics"""
         try:
-            if hasattr(request, '_body'):
-                body = await request.body()
-                if body:
-                    data = json.loads(body)
-                    message = data.get('text', data.get('message', ''))
-                    
-                    # Mock cultural context (you can enhance this)
-                    cultural_context = {
-                        "primaryCulture": "thai" if any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message) else "international",
-                        "formalityLevel": 0.7,
-                        "politenessLevel": 0.8
-                    }
-                    
-                    self.monitor.track_chat_request(
-                        message=message,
-                        cultural_context=cultural_context,
-                        processing_time=processing_time,
-                        ai_platform="openai"  # Default, you can detect from request
-                    )
+            # Only a JSON object carries a message; anything else is not worth parsing
+            if body.rstrip().endswith(b"}"):
+                data = _loads(body)
+                message = data.get('text', data.get('message', ''))
+                
+                cultural_context = _CTX_THAI if _THAI_RE.search(message) else _CTX_INTL
+                
+                self.monitor.track_chat_request(
+                    message=message,
+                    cultural_context=cultural_context,
+                    processing_time=processing_time,
+                    ai_platform="openai"  # Default, you can detect from request
+                )
         except Exception as e:
             logger.warning(f"Could not track chat request: {e}")
             
-    async def _track_cultural_request(self, request: Request, response: Response, processing_time: float):
+    async def _track_cultural_request(self, processing_time: float):
         """Track cultural analysis requests"""
         try:
             # Track cultural analysis
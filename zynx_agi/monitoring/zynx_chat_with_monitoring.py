@@ -1,16 +1,15 @@
 # zynx_agi/api/chat.py (Enhanced with Monitoring)
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_serializer
 from typing import Dict, Any, List, Optional, Union, Literal
+import re
 import json
 import logging
-import asyncio
 from datetime import datetime
-from ..config.settings import settings
 from ..cultural.thai_cultural_engine import ThaiCulturalEngine
-from ..ai_platforms.openai_client import OpenAIClient
-from ..ai_platforms.claude_client import ClaudeClient
+from ..ai_platforms.openai_client import OpenAIClient, aclose_shared_clients as aclose_openai_clients
+from ..ai_platforms.claude_client import ClaudeClient, aclose_shared_clients as aclose_claude_clients
 from ..ai_platforms.thai_cultural_mcp import get_current_user, TokenData
 import httpx
 
@@ -22,6 +21,9 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Any character in the Thai Unicode block
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+
 router = APIRouter(prefix="/chat", tags=["chat"])
 cultural_engine = ThaiCulturalEngine()
 
@@ -57,7 +59,11 @@ class WebSocketMessage(BaseModel):
     """WebSocket message model"""
     type: Literal["message", "typing", "error", "system", "monitoring"] = Field(..., description="Message type")
     content: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: float = Field(default_factory=time.time)  # Epoch seconds; ISO 8601 when serialized
+
+    @field_serializer("timestamp")
+    def serialize_timestamp(self, timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).isoformat()
 
 # Enhanced WebSocket Connection Manager with Monitoring
 class ConnectionManager:
@@ -92,7 +98,7 @@ class ConnectionManager:
 
     async def send_message(self, client_id: str, message: WebSocketMessage):
         if client_id in self.active_connections:
-            await self.active_connections[client_id].send_json(message.dict())
+            await self.active_connections[client_id].send_json(message.model_dump(mode="json"))
             if client_id in self.user_sessions:
                 self.user_sessions[client_id]["message_count"] += 1
                 self.user_sessions[client_id]["last_message"] = datetime.now()
@@ -100,7 +106,7 @@ class ConnectionManager:
     async def broadcast(self, message: WebSocketMessage, exclude: Optional[str] = None):
         for client_id, connection in self.active_connections.items():
             if client_id != exclude:
-                await connection.send_json(message.dict())
+                await connection.send_json(message.model_dump(mode="json"))
 
     async def send_monitoring_update(self, client_id: str, metrics: Dict[str, Any]):
         """Send real-time monitoring data to WebSocket client"""
@@ -127,11 +133,26 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 # AI Client Factory
+# One long-lived client per provider, created on first use and closed at shutdown
+_ai_clients: Dict[str, Union[OpenAIClient, ClaudeClient]] = {}
+
 def get_ai_client(model: Optional[str] = None) -> Union[OpenAIClient, ClaudeClient]:
     """Get appropriate AI client based on model selection"""
-    if model == "claude":
-        return ClaudeClient()
-    return OpenAIClient()  # Default to OpenAI
+    provider = "claude" if model == "claude" else "openai"  # Default to OpenAI
+    client = _ai_clients.get(provider)
+    if client is None:
+        client = ClaudeClient() if provider == "claude" else OpenAIClient()
+        _ai_clients[provider] = client
+    return client
+
+@router.on_event("shutdown")
+async def close_ai_clients():
+    for client in _ai_clients.values():
+        await client.close()
+    _ai_clients.clear()
+    # Instance close() is a no-op; the pooled SDK clients behind them are closed here
+    await aclose_openai_clients()
+    await aclose_claude_clients()
 
 async def process_message_with_cultural_context(
     message: ChatMessage,
@@ -140,11 +161,11 @@ async def process_message_with_cultural_context(
     """Process message with cultural context and monitoring"""
     
     # ========== MONITORING: TRACK INFERENCE START ==========
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     ai_platform = "claude" if isinstance(client, ClaudeClient) else "openai"
     
     cultural_context_dict = {
-        "primaryCulture": "thai" if any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message.text) else "international",
+        "primaryCulture": "thai" if _THAI_RE.search(message.text) else "international",
         "formalityLevel": message.context.formality_level if message.context else 0.7,
         "politenessLevel": message.context.politeness_level if message.context else 0.7
     }
@@ -158,18 +179,18 @@ async def process_message_with_cultural_context(
                 "context_type": "formal" if message.context.formality_level > 0.7 else "informal"
             })
             message.text = processed_context["adjusted_text"]
-            message.context = CulturalContext(**processed_context["cultural_context"])
+            message.context = CulturalContext.model_validate(processed_context["cultural_context"])
 
         # Generate response
         response = await client.generate_response(
             message=message.text,
-            cultural_context=message.context.dict() if message.context else None,
+            cultural_context=message.context.model_dump() if message.context else None,
             temperature=message.temperature,
             max_tokens=message.max_tokens
         )
         
         # ========== MONITORING: TRACK SUCCESS ==========
-        processing_time = (time.time() - start_time) * 1000
+        processing_time = (time.perf_counter_ns() - start_time) / 1_000_000
         zynx_monitor.track_chat_request(
             message=message.text,
             cultural_context=cultural_context_dict,
@@ -213,7 +234,7 @@ class ThaiCulturalMCPClient:
 
     async def analyze_cultural_context(self, text: str) -> Dict[str, Any]:
         # ========== MONITORING: TRACK MCP USAGE ==========
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         # ===============================================
         
         if not self.token:
@@ -227,7 +248,7 @@ class ThaiCulturalMCPClient:
             )
             
             # ========== MONITORING: TRACK MCP ANALYSIS ==========
-            processing_time = (time.time() - start_time) * 1000
+            processing_time = (time.perf_counter_ns() - start_time) / 1_000_000
             zynx_monitor.cultural_analyses += 1
             logger.info(f"🧠 MCP Cultural Analysis: {processing_time:.1f}ms")
             # ==================================================
@@ -264,17 +285,17 @@ async def chat_message(
     background_tasks: BackgroundTasks
 ):
     """Process a chat message with cultural context and monitoring"""
-    start_time = datetime.now()
+    start_time = time.perf_counter_ns()
 
     # ========== MONITORING: START TRACKING ==========
     ai_platform = message.model
     cultural_context_dict = {
-        "primaryCulture": "thai" if any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message.text) else "international",
+        "primaryCulture": "thai" if _THAI_RE.search(message.text) else "international",
         "formalityLevel": message.context.formality_level if message.context else 0.7,
         "politenessLevel": message.context.politeness_level if message.context else 0.7
     }
     
-    with track_chat_inference(message.text, cultural_context_dict, ai_platform) as tracker:
+    with track_chat_inference(message.text, cultural_context_dict, ai_platform):
     # ==============================================
     
         try:
@@ -285,11 +306,7 @@ async def chat_message(
             response = await process_message_with_cultural_context(message, client)
 
             # Calculate processing time
-            processing_time = (datetime.now() - start_time).total_seconds()
-
-            # ========== SET TRACKING SUCCESS ==========
-            tracker.set_success(True)
-            # =========================================
+            processing_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
 
             # Log usage in background
             background_tasks.add_task(
@@ -315,9 +332,6 @@ async def chat_message(
                 status_code=500,
                 detail=f"Error processing message: {str(e)}"
             )
-        finally:
-            if 'client' in locals():
-                await client.close()
 
 async def log_chat_usage(message: ChatMessage, response: Dict[str, Any], processing_time: float):
     """Enhanced chat usage logging with monitoring metrics"""
@@ -344,10 +358,10 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             message_data = json.loads(data)
 
             # Create chat message
-            chat_message = ChatMessage(**message_data)
+            chat_message = ChatMessage.model_validate(message_data)
             
             # ========== MONITORING: DETECT CULTURAL CONTEXT ==========
-            is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in chat_message.text)
+            is_thai = _THAI_RE.search(chat_message.text) is not None
             cultural_context = "thai" if is_thai else "international"
             ai_platform = chat_message.model
             
@@ -366,14 +380,14 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
             try:
                 # ========== MONITORING: TRACK WEBSOCKET INFERENCE ==========
-                start_time = time.time()
+                start_time = time.perf_counter_ns()
                 cultural_context_dict = {
                     "primaryCulture": cultural_context,
                     "formalityLevel": 0.7,
                     "politenessLevel": 0.8 if is_thai else 0.7
                 }
                 
-                with track_chat_inference(chat_message.text, cultural_context_dict, ai_platform) as tracker:
+                with track_chat_inference(chat_message.text, cultural_context_dict, ai_platform):
                 # ==========================================================
 
                     # Get AI client
@@ -382,10 +396,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                     # Process message and generate response
                     response = await process_message_with_cultural_context(chat_message, client)
                     
-                    # ========== SET TRACKING SUCCESS ==========
-                    tracker.set_success(True)
-                    # =========================================
-
                     # Send response with monitoring data
                     await manager.send_message(
                         client_id,
@@ -422,9 +432,6 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
                         content={"error": str(e), "ai_platform": ai_platform}
                     )
                 )
-            finally:
-                if 'client' in locals():
-                    await client.close()
 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
@@ -463,7 +470,7 @@ async def chat(
     current_user: TokenData = Depends(get_current_user)
 ):
     """Chat endpoint with cultural intelligence and monitoring"""
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
         # Analyze cultural context
@@ -482,7 +489,7 @@ async def chat(
         )
         
         # ========== MONITORING: TRACK MCP CHAT ==========
-        processing_time = (time.time() - start_time) * 1000
+        processing_time = (time.perf_counter_ns() - start_time) / 1_000_000
         cultural_context_dict = {
             "primaryCulture": cultural_analysis.get("primary_culture", "unknown"),
             "formalityLevel": cultural_analysis["formality_level"],
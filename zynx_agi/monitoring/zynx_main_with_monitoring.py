@@ -3,6 +3,7 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import re
 import uvicorn
 import logging
 from .config.settings import settings
@@ -16,6 +17,9 @@ from .monitoring.zynx_monitor import zynx_monitor
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Any character in the Thai Unicode block
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+
 # Create FastAPI app
 app = FastAPI(
     title="ZynxAGI",
@@ -107,7 +111,7 @@ async def chat_message(request: dict):
         message = request.get("message", "")
 
         # Detect Thai or English
-        is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message)
+        is_thai = _THAI_RE.search(message) is not None
 
         if "สวัสดี" in message or "hello" in message.lower() or "hi" in message.lower():
             if is_thai:
@@ -182,7 +186,7 @@ async def cultural_analyze(request: dict):
         text = request.get("text", "")
 
         # Simple but effective cultural analysis
-        is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in text)
+        is_thai = _THAI_RE.search(text) is not None
         has_politeness = any(particle in text for particle in ["ครับ", "ค่ะ", "นะ", "จ้ะ"])
 
         result = {
@@ -4,6 +4,7 @@ Custom Monitoring Integration for Zynx AGI Engine
 Seamlessly integrates with existing architecture
 """
 
+import re
 import time
 import psutil
 import json
@@ -12,15 +13,24 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from fastapi import FastAPI, Request, Response, WebSocket
-from fastapi.middleware.base import BaseHTTPMiddleware
 import sqlite3
 import threading
 from collections import deque
 import numpy as np
 import logging
 
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    from json import dumps as _dumps
+
+from ..core.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Any character in the Thai Unicode block
+_THAI_RE = re.compile(r"[\u0E00-\u0E7F]")
+
 @dataclass
 class ZynxAGIMetrics:
     """Enhanced metrics for Zynx AGI performance tracking"""
@@ -66,6 +76,12 @@ class ZynxAGIMonitor:
         self.start_time = datetime.now()
         self.is_monitoring = False
         self.websocket_clients = set()
+        # Event loop serving the dashboard sockets; the monitoring thread hands broadcasts to it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Summaries per `hours`, shared by the dashboard endpoints that poll them together
+        self._summary_cache = TTLCache(maxsize=32, ttl=2.0)
+        # /metrics/current body, serialized once per collected sample
+        self.latest_metrics_json: Optional[bytes] = None
         
         # Zynx-specific counters
         self.chat_requests = 0
@@ -74,6 +90,13 @@ class ZynxAGIMonitor:
         self.english_messages = 0
         self.ai_platform_usage = {"openai": 0, "claude": 0, "errors": 0}
         self.websocket_connections = 0
+        # Guards websocket_connections, which request coroutines and socket handlers both update
+        self._active_lock = threading.Lock()
+        # Cultural events waiting to be written; the monitoring thread stores them in batches
+        self._pending_events: deque = deque()
+        self.monitor_thread: Optional[threading.Thread] = None
+        # Set by stop_monitoring() so the loop wakes from its sleep instead of finishing it
+        self._stop_event = threading.Event()
         self.cultural_context_switches = 0
         
         self._init_database()
@@ -133,6 +156,7 @@ class ZynxAGIMonitor:
     def start_monitoring(self):
         """Start the Zynx monitoring loop"""
         self.is_monitoring = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitor_thread.start()
         logger.info("🚀 Zynx AGI Monitoring System ACTIVATED!")
@@ -140,6 +164,12 @@ class ZynxAGIMonitor:
     def stop_monitoring(self):
         """Stop the monitoring loop"""
         self.is_monitoring = False
+        self._stop_event.set()
+        # The loop flushes too; wait for it so the final drain below is the only one running
+        if self.monitor_thread is not None:
+            self.monitor_thread.join()
+            self.monitor_thread = None
+        self._flush_cultural_events()
         logger.info("⏹️ Zynx AGI Monitoring System DEACTIVATED")
         
     def _monitoring_loop(self):
@@ -150,11 +180,12 @@ class ZynxAGIMonitor:
                 self._store_metrics(metrics)
                 self._analyze_zynx_performance(metrics)
                 self._broadcast_to_websockets(metrics)
+                self._flush_cultural_events()
                 
             except Exception as e:
                 logger.error(f"❌ Zynx Monitoring error: {e}")
                 
-            time.sleep(3)  # Faster collection for real-time chat
+            self._stop_event.wait(3)  # Faster collection for real-time chat
             
     def _collect_zynx_metrics(self) -> ZynxAGIMetrics:
         """Collect Zynx AGI specific metrics"""
@@ -279,6 +310,7 @@ class ZynxAGIMonitor:
     def _store_metrics(self, metrics: ZynxAGIMetrics):
         """Store metrics to database"""
         self.metrics_buffer.append(metrics)
+        self.latest_metrics_json = _dumps(self._current_metrics_payload(metrics))
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -291,20 +323,69 @@ class ZynxAGIMonitor:
         conn.commit()
         conn.close()
         
+    @staticmethod
+    def _current_metrics_payload(latest: ZynxAGIMetrics) -> Dict[str, Any]:
+        """Dashboard view of one metrics sample"""
+        return {
+            "timestamp": latest.timestamp.isoformat(),
+            "performance": {
+                "inference_time_ms": latest.inference_time_ms,
+                "tokens_per_second": latest.tokens_per_second,
+                "concurrent_requests": latest.concurrent_requests,
+                "queue_depth": latest.queue_depth
+            },
+            "cultural_intelligence": {
+                "cultural_accuracy": latest.cultural_accuracy_score,
+                "emotional_intelligence": latest.emotional_intelligence_score,
+                "thai_proficiency": latest.thai_language_proficiency,
+                "formality_detection": latest.formality_detection_accuracy,
+                "avg_politeness": latest.politeness_level_avg
+            },
+            "ai_platforms": {
+                "openai_requests": latest.openai_requests,
+                "claude_requests": latest.claude_requests,
+                "errors": latest.ai_platform_errors
+            },
+            "system": {
+                "cpu_percent": latest.cpu_percent,
+                "memory_percent": latest.memory_percent,
+                "active_websockets": latest.active_websockets,
+                "success_rate": latest.success_rate,
+                "uptime_seconds": latest.uptime_seconds
+            },
+            "language_usage": {
+                "thai_ratio": latest.thai_messages_ratio,
+                "english_ratio": latest.english_messages_ratio,
+                "cultural_switches": latest.cultural_context_switches
+            }
+        }
+        
+    def add_websocket_client(self, websocket: WebSocket):
+        """Register a dashboard socket; must be called from the event loop serving it"""
+        self._loop = asyncio.get_running_loop()
+        self.websocket_clients.add(websocket)
+        
+    async def broadcast(self, data: Dict[str, Any]):
+        """Send data to every dashboard socket concurrently and drop the ones that fail"""
+        payload = json.dumps(data)
+        clients = list(self.websocket_clients)
+        results = await asyncio.gather(
+            *(client.send_text(payload) for client in clients),
+            return_exceptions=True
+        )
+        self.websocket_clients -= {
+            client for client, result in zip(clients, results) if isinstance(result, Exception)
+        }
+        
     def _broadcast_to_websockets(self, metrics: ZynxAGIMetrics):
         """Broadcast real-time metrics to dashboard"""
-        if self.websocket_clients:
+        loop = self._loop
+        if self.websocket_clients and loop is not None and not loop.is_closed():
             data = asdict(metrics)
             data["timestamp"] = metrics.timestamp.isoformat()
             
-            disconnected = set()
-            for client in self.websocket_clients:
-                try:
-                    asyncio.create_task(client.send_text(json.dumps(data)))
-                except:
-                    disconnected.add(client)
-            
-            self.websocket_clients -= disconnected
+            # Called from the monitoring thread, so the sends are scheduled onto the server loop
+            asyncio.run_coroutine_threadsafe(self.broadcast(data), loop)
             
     # Zynx-specific tracking methods
     def track_chat_request(self, message: str, cultural_context: Dict[str, Any], 
@@ -313,7 +394,7 @@ class ZynxAGIMonitor:
         self.chat_requests += 1
         
         # Detect language
-        is_thai = any(ord(char) >= 0x0E00 and ord(char) <= 0x0E7F for char in message)
+        is_thai = _THAI_RE.search(message) is not None
         if is_thai:
             self.thai_messages += 1
         else:
@@ -325,51 +406,88 @@ class ZynxAGIMonitor:
         elif ai_platform.lower() == "claude":
             self.ai_platform_usage["claude"] += 1
             
-        # Store cultural event
-        self._store_cultural_event(message, cultural_context, processing_time, ai_platform)
+        # Store cultural event; queued for the monitoring thread so requests never wait on SQLite
+        event = (time.time(), message[:100], cultural_context, processing_time, ai_platform)
+        if self.is_monitoring:
+            self._pending_events.append(event)
+            # Monitoring stopped between the check and the append: the final drain may
+            # already have run, so flush here rather than leave the event queued
+            if not self.is_monitoring:
+                self._flush_cultural_events()
+        else:
+            self._store_cultural_events([event])
         
     def track_cultural_context_switch(self, from_culture: str, to_culture: str):
         """Track when cultural context changes"""
         self.cultural_context_switches += 1
         logger.info(f"Cultural context switch: {from_culture} → {to_culture}")
         
+    def inc_active(self):
+        """Count one more active request or connection"""
+        with self._active_lock:
+            self.websocket_connections += 1
+            
+    def dec_active(self):
+        """Release a count taken with inc_active(); callers pair the two exactly"""
+        with self._active_lock:
+            self.websocket_connections -= 1
+            
     def track_websocket_connection(self, connected: bool):
         """Track WebSocket connections"""
         if connected:
-            self.websocket_connections += 1
+            self.inc_active()
         else:
-            self.websocket_connections = max(0, self.websocket_connections - 1)
+            # Disconnects may arrive for sockets that never registered, so this one is floored
+            with self._active_lock:
+                self.websocket_connections = max(0, self.websocket_connections - 1)
             
     def track_ai_platform_error(self, platform: str, error: str):
         """Track AI platform errors"""
         self.ai_platform_usage["errors"] += 1
         logger.error(f"AI Platform Error [{platform}]: {error}")
         
-    def _store_cultural_event(self, message: str, cultural_context: Dict[str, Any], 
-                             processing_time: float, ai_platform: str):
-        """Store cultural processing event"""
+    def _flush_cultural_events(self):
+        """Store every queued cultural event in one transaction"""
+        events = []
+        while True:
+            try:
+                events.append(self._pending_events.popleft())
+            except IndexError:
+                break
+        if events:
+            self._store_cultural_events(events)
+            
+    def _store_cultural_events(self, events: List[tuple]):
+        """Store cultural processing events"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.executemany('''
             INSERT INTO zynx_cultural_events 
             (timestamp, message_text, detected_culture, formality_level, politeness_level, cultural_adjustments, processing_time_ms)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
-            message[:100],  # Truncate for privacy
+        ''', [(
+            datetime.fromtimestamp(timestamp).isoformat(),
+            message,  # Truncated for privacy
             cultural_context.get("primaryCulture", "unknown"),
             cultural_context.get("formalityLevel", 0.0),
             cultural_context.get("politenessLevel", 0.0),
             json.dumps({"platform": ai_platform, "context": cultural_context}),
             processing_time
-        ))
+        ) for timestamp, message, cultural_context, processing_time, ai_platform in events])
         
         conn.commit()
         conn.close()
         
     def get_zynx_performance_summary(self, hours: int = 24) -> Dict[str, Any]:
-        """Get Zynx AGI specific performance summary"""
+        """Get Zynx AGI specific performance summary (recomputed at most every 2 seconds)"""
+        summary = self._summary_cache.get(hours)
+        if summary is None:
+            summary = self._compute_zynx_performance_summary(hours)
+            self._summary_cache.set(hours, summary)
+        return summary
+        
+    def _compute_zynx_performance_summary(self, hours: int) -> Dict[str, Any]:
         since = datetime.now() - timedelta(hours=hours)
         recent_metrics = [m for m in self.metrics_buffer if m.timestamp >= since]
         